@@ -0,0 +1,33 @@
+"""add_social_post_retry_count
+
+Revision ID: a9e2f7c4d1b8
+Revises: f4b8d2c6a1e9
+Create Date: 2026-08-29 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9e2f7c4d1b8'
+down_revision: Union[str, None] = 'f4b8d2c6a1e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    # Retry counter for transient publish failures (idempotent)
+    result = conn.execute(sa.text(
+        "SELECT column_name FROM information_schema.columns "
+        "WHERE table_name='social_posts' AND column_name='retry_count'"
+    ))
+    if result.fetchone() is None:
+        op.add_column('social_posts', sa.Column('retry_count', sa.Integer(), nullable=True, server_default='0'))
+
+
+def downgrade() -> None:
+    op.drop_column('social_posts', 'retry_count')
@@ -0,0 +1,55 @@
+"""unique_purchase_lookup_indexes
+
+Revision ID: b3c9d8e1f5a7
+Revises: a9e2f7c4d1b8
+Create Date: 2026-08-29 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3c9d8e1f5a7'
+down_revision: Union[str, None] = 'a9e2f7c4d1b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    # Unique lookup index for the webhook's session -> purchase resolution
+    result = conn.execute(sa.text(
+        "SELECT indexname FROM pg_indexes "
+        "WHERE indexname='ix_lead_purchases_stripe_checkout_session_id'"
+    ))
+    if result.fetchone() is None:
+        op.create_index(
+            'ix_lead_purchases_stripe_checkout_session_id',
+            'lead_purchases',
+            ['stripe_checkout_session_id'],
+            unique=True,
+        )
+
+    # One notification per (company, lead): recreate the pair index as unique
+    result = conn.execute(sa.text(
+        "SELECT indexdef FROM pg_indexes WHERE indexname='idx_notification_company_lead'"
+    ))
+    row = result.fetchone()
+    if row is None or 'UNIQUE' not in row[0]:
+        if row is not None:
+            op.drop_index('idx_notification_company_lead', table_name='lead_notifications')
+        op.create_index(
+            'idx_notification_company_lead',
+            'lead_notifications',
+            ['company_id', 'lead_id'],
+            unique=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_lead_purchases_stripe_checkout_session_id', table_name='lead_purchases')
+    op.drop_index('idx_notification_company_lead', table_name='lead_notifications')
+    op.create_index('idx_notification_company_lead', 'lead_notifications', ['company_id', 'lead_id'])
@@ -0,0 +1,36 @@
+"""add_company_base_coords_index
+
+Revision ID: b7e4d9c0a1f2
+Revises: a1b2c3d4e5f6
+Create Date: 2026-08-29 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e4d9c0a1f2'
+down_revision: Union[str, None] = 'a1b2c3d4e5f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    # Composite index for the bounding-box prefilter in lead matching (idempotent)
+    result = conn.execute(sa.text(
+        "SELECT indexname FROM pg_indexes WHERE indexname='idx_companies_base_lat_lng'"
+    ))
+    if result.fetchone() is None:
+        op.create_index(
+            'idx_companies_base_lat_lng',
+            'companies',
+            ['base_lat', 'base_lng'],
+        )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_companies_base_lat_lng', table_name='companies')
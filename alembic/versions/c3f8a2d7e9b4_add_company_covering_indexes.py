@@ -0,0 +1,50 @@
+"""add_company_covering_indexes
+
+Revision ID: c3f8a2d7e9b4
+Revises: b7e4d9c0a1f2
+Create Date: 2026-08-29 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f8a2d7e9b4'
+down_revision: Union[str, None] = 'b7e4d9c0a1f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _index_missing(conn, name: str) -> bool:
+    result = conn.execute(sa.text(
+        "SELECT indexname FROM pg_indexes WHERE indexname=:name"
+    ), {"name": name})
+    return result.fetchone() is None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    # Covering indexes for the company dashboard (idempotent)
+    if _index_missing(conn, 'idx_purchase_company_covering'):
+        op.create_index(
+            'idx_purchase_company_covering',
+            'lead_purchases',
+            ['company_id'],
+            postgresql_include=['lead_id', 'price_pence', 'payment_status', 'paid_at'],
+        )
+
+    if _index_missing(conn, 'idx_notification_company_covering'):
+        op.create_index(
+            'idx_notification_company_covering',
+            'lead_notifications',
+            ['company_id'],
+            postgresql_include=['lead_id', 'sent_at', 'opened_at', 'purchased_at'],
+        )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_notification_company_covering', table_name='lead_notifications')
+    op.drop_index('idx_purchase_company_covering', table_name='lead_purchases')
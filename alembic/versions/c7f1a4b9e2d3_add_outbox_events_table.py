@@ -0,0 +1,44 @@
+"""add_outbox_events_table
+
+Revision ID: c7f1a4b9e2d3
+Revises: b3c9d8e1f5a7
+Create Date: 2026-08-29 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7f1a4b9e2d3'
+down_revision: Union[str, None] = 'b3c9d8e1f5a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    # Outbox table for post-commit side effects (idempotent)
+    result = conn.execute(sa.text(
+        "SELECT EXISTS (SELECT FROM information_schema.tables WHERE table_name='outbox_events')"
+    ))
+    if not result.scalar():
+        op.create_table('outbox_events',
+            sa.Column('id', sa.UUID(), nullable=False, server_default=sa.text('gen_random_uuid()')),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+            sa.Column('kind', sa.String(length=50), nullable=False),
+            sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+            sa.Column('processed_at', sa.DateTime(timezone=True), nullable=True),
+            sa.Column('attempts', sa.Integer(), nullable=True, server_default='0'),
+            sa.Column('last_error', sa.Text(), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_outbox_events_kind', 'outbox_events', ['kind'])
+        op.create_index('ix_outbox_events_processed_at', 'outbox_events', ['processed_at'])
+
+
+def downgrade() -> None:
+    op.drop_table('outbox_events')
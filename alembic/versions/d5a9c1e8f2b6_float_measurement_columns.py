@@ -0,0 +1,37 @@
+"""float_measurement_columns
+
+Revision ID: d5a9c1e8f2b6
+Revises: c3f8a2d7e9b4
+Create Date: 2026-08-29 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a9c1e8f2b6'
+down_revision: Union[str, None] = 'c3f8a2d7e9b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Measurement columns moving from NUMERIC to double precision.
+# Money columns stay as they are (prices are integer pence).
+_LEAD_ITEM_COLUMNS = ('length_cm', 'width_cm', 'height_cm', 'weight_kg', 'cbm')
+_LEAD_COLUMNS = ('total_cbm', 'total_weight_kg')
+
+
+def upgrade() -> None:
+    for col in _LEAD_ITEM_COLUMNS:
+        op.alter_column('lead_items', col, type_=sa.Float(), existing_nullable=True)
+    for col in _LEAD_COLUMNS:
+        op.alter_column('leads', col, type_=sa.Float(), existing_nullable=True)
+
+
+def downgrade() -> None:
+    for col in _LEAD_COLUMNS:
+        op.alter_column('leads', col, type_=sa.Numeric(10, 2), existing_nullable=True)
+    for col in _LEAD_ITEM_COLUMNS:
+        numeric = sa.Numeric(10, 4) if col == 'cbm' else sa.Numeric(10, 2)
+        op.alter_column('lead_items', col, type_=numeric, existing_nullable=True)
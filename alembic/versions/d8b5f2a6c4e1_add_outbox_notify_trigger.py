@@ -0,0 +1,39 @@
+"""add_outbox_notify_trigger
+
+Revision ID: d8b5f2a6c4e1
+Revises: c7f1a4b9e2d3
+Create Date: 2026-08-29 13:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8b5f2a6c4e1'
+down_revision: Union[str, None] = 'c7f1a4b9e2d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Wake the outbox listener the moment an event row commits
+    op.execute("""
+        CREATE OR REPLACE FUNCTION outbox_notify() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('outbox', NEW.id::text);
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("DROP TRIGGER IF EXISTS outbox_notify ON outbox_events")
+    op.execute(
+        "CREATE TRIGGER outbox_notify AFTER INSERT ON outbox_events "
+        "FOR EACH ROW EXECUTE FUNCTION outbox_notify()"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS outbox_notify ON outbox_events")
+    op.execute("DROP FUNCTION IF EXISTS outbox_notify()")
@@ -0,0 +1,38 @@
+"""add_daily_revenue_matview
+
+Revision ID: e1c6b3a9d4f7
+Revises: d5a9c1e8f2b6
+Create Date: 2026-08-29 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1c6b3a9d4f7'
+down_revision: Union[str, None] = 'd5a9c1e8f2b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE MATERIALIZED VIEW IF NOT EXISTS mv_daily_revenue AS "
+        "SELECT date_trunc('day', paid_at) AS day, "
+        "       COUNT(*) AS purchases, "
+        "       SUM(price_pence) AS revenue_pence "
+        "FROM lead_purchases "
+        "WHERE payment_status = 'paid' AND paid_at IS NOT NULL "
+        "GROUP BY 1"
+    )
+    # Unique index required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_daily_revenue_day "
+        "ON mv_daily_revenue (day)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_daily_revenue")
@@ -0,0 +1,45 @@
+"""add_lead_purchase_summary
+
+Revision ID: e6a3b8f1c9d2
+Revises: d8b5f2a6c4e1
+Create Date: 2026-08-29 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6a3b8f1c9d2'
+down_revision: Union[str, None] = 'd8b5f2a6c4e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    # Denormalized lead snapshot for purchase-history lists (idempotent)
+    result = conn.execute(sa.text(
+        "SELECT column_name FROM information_schema.columns "
+        "WHERE table_name='lead_purchases' AND column_name='summary'"
+    ))
+    if result.fetchone() is None:
+        op.add_column('lead_purchases', sa.Column('summary', sa.String(length=255), nullable=True))
+
+    # Backfill existing purchases so history lists never fall back to
+    # lazy-loading the lead (mirrors purchase_summary() in stripe_billing)
+    conn.execute(sa.text(
+        "UPDATE lead_purchases SET summary = "
+        "coalesce(nullif(l.pickup->>'city', ''), nullif(l.pickup->>'postcode', ''), 'Unknown')"
+        " || ' to ' || "
+        "coalesce(nullif(l.dropoff->>'city', ''), nullif(l.dropoff->>'postcode', ''), 'Unknown')"
+        " || ' | ' || coalesce(l.total_cbm, 0) || ' CBM' "
+        "FROM leads l "
+        "WHERE lead_purchases.lead_id = l.id AND lead_purchases.summary IS NULL"
+    ))
+
+
+def downgrade() -> None:
+    op.drop_column('lead_purchases', 'summary')
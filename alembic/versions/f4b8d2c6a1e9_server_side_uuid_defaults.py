@@ -0,0 +1,38 @@
+"""server_side_uuid_defaults
+
+Revision ID: f4b8d2c6a1e9
+Revises: e1c6b3a9d4f7
+Create Date: 2026-08-29 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4b8d2c6a1e9'
+down_revision: Union[str, None] = 'e1c6b3a9d4f7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_TABLES = (
+    'leads', 'lead_rooms', 'lead_items', 'lead_photos', 'companies',
+    'lead_purchases', 'lead_notifications', 'lead_pricing_tiers',
+    'admin_users', 'email_logs', 'stripe_events', 'error_logs',
+    'social_posts', 'social_accounts', 'social_config',
+)
+
+
+def upgrade() -> None:
+    # gen_random_uuid() is built in since Postgres 13; pgcrypto covers older
+    op.execute("CREATE EXTENSION IF NOT EXISTS pgcrypto")
+    for table in _TABLES:
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT gen_random_uuid()"
+        )
+
+
+def downgrade() -> None:
+    for table in _TABLES:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN id DROP DEFAULT")
@@ -12,7 +12,7 @@ from datetime import datetime, timedelta, timezone
 from fastapi import APIRouter, Depends, Form, Request
 from fastapi.responses import RedirectResponse
 from fastapi.templating import Jinja2Templates
-from sqlalchemy import case, func
+from sqlalchemy import case, func, text
 from sqlalchemy.orm import Session
 
 from app.auth import create_access_token, verify_password
@@ -330,6 +330,52 @@ async def admin_toggle_pricing_tier(
 # ---------------------------------------------------------------------------
 # 11. GET /admin/revenue -- Revenue report (paid purchases)
 # ---------------------------------------------------------------------------
+def _daily_revenue_rows(db: Session, limit: int = 30):
+    """Daily revenue series for the revenue report.
+
+    On Postgres this reads the pre-aggregated mv_daily_revenue
+    materialized view (refreshed nightly by the scheduler), so the
+    report stays O(days) as lead_purchases grows. Other backends
+    (SQLite in tests) fall back to a live GROUP BY.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        result = db.execute(
+            text(
+                "SELECT day, purchases, revenue_pence FROM mv_daily_revenue "
+                "ORDER BY day DESC LIMIT :limit"
+            ),
+            {"limit": limit},
+        )
+        return result.fetchall()
+
+    return (
+        db.query(
+            func.date(LeadPurchase.paid_at).label("day"),
+            func.count(LeadPurchase.id).label("purchases"),
+            func.sum(LeadPurchase.price_pence).label("revenue_pence"),
+        )
+        .filter(
+            LeadPurchase.payment_status == "paid",
+            LeadPurchase.paid_at.isnot(None),
+        )
+        .group_by(func.date(LeadPurchase.paid_at))
+        .order_by(func.date(LeadPurchase.paid_at).desc())
+        .limit(limit)
+        .all()
+    )
+
+
+def refresh_daily_revenue_view():
+    """Refresh mv_daily_revenue. Scheduled nightly; Postgres only."""
+    from app.database import engine
+
+    if engine is None or engine.dialect.name != "postgresql":
+        return
+    # CONCURRENTLY cannot run inside a transaction block
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY mv_daily_revenue"))
+
+
 @router.get("/admin/revenue")
 async def admin_revenue(
     request: Request,
@@ -359,6 +405,7 @@ async def admin_revenue(
             "active_page": "revenue",
             "purchases": purchases,
             "total_revenue": total_revenue,
+            "daily_revenue": _daily_revenue_rows(db),
         },
     )
 
@@ -32,6 +32,7 @@ from app.database import get_db
 from app.rate_limit import limiter
 from app.dependencies import get_current_company
 from app.geo import extract_city_from_label, extract_postcode_area
+from app.outbox import enqueue_outbox_event
 from app.models import (
     Company,
     Lead,
@@ -42,6 +43,7 @@ from app.models import (
     LeadRoom,
 )
 from app.pricing import calculate_lead_price_pence
+from app.stripe_billing import purchase_summary
 
 # ---------------------------------------------------------------------------
 # Lazy Stripe import -- may not be installed in dev environments
@@ -162,6 +164,11 @@ async def register_submit(
         password_hash=hash_password(password),
     )
     db.add(company)
+    db.flush()
+
+    # Pre-provision the Stripe customer in the background so the first
+    # lead purchase pays a single Stripe round-trip at checkout
+    enqueue_outbox_event(db, "ensure_stripe_customer", {"company_id": str(company.id)})
     db.commit()
 
     return RedirectResponse(
@@ -567,6 +574,7 @@ async def lead_purchase(
                 lead_id=lead.id,
                 company_id=company.id,
                 price_pence=price_pence,
+                summary=purchase_summary(lead),
                 stripe_checkout_session_id=checkout_session.id,
                 payment_status="pending",
             )
@@ -593,6 +601,7 @@ async def lead_purchase(
         lead_id=lead.id,
         company_id=company.id,
         price_pence=price_pence,
+        summary=purchase_summary(lead),
         payment_status="paid",
         paid_at=datetime.now(timezone.utc),
     )
@@ -754,9 +763,11 @@ async def purchases_list(
     company: Company = Depends(get_current_company),
     db: Session = Depends(get_db),
 ):
+    # The denormalized summary column covers everything the list renders,
+    # so no join back to leads; rows predating the column lazy-load the
+    # lead as a fallback in the template
     purchases = (
         db.query(LeadPurchase)
-        .options(joinedload(LeadPurchase.lead))
         .filter(LeadPurchase.company_id == company.id)
         .order_by(LeadPurchase.created_at.desc())
         .all()
@@ -1,5 +1,7 @@
 import logging
 import os
+
+import orjson
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
 from dotenv import load_dotenv
@@ -21,13 +23,23 @@ if not DATABASE_URL:
 else:
     DATABASE_URL = normalize_database_url(DATABASE_URL)
 
-    engine = create_engine(
-        DATABASE_URL,
+    engine_kwargs = dict(
         pool_pre_ping=True,
         pool_size=10,
         max_overflow=20,
         echo=False,
+        # orjson decodes/encodes the JSONB columns (pickup/dropoff, access
+        # blobs, preferences) 2-3x faster than stdlib json
+        json_deserializer=orjson.loads,
+        json_serializer=lambda obj: orjson.dumps(obj).decode(),
     )
+    if DATABASE_URL.startswith("postgresql+psycopg2://"):
+        # psycopg2's default executemany issues one round-trip per row;
+        # values_plus_batch collapses bulk INSERTs (e.g. lead notification
+        # fan-out) into a single statement. psycopg3 batches natively.
+        engine_kwargs["executemany_mode"] = "values_plus_batch"
+
+    engine = create_engine(DATABASE_URL, **engine_kwargs)
 
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
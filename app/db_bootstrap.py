@@ -0,0 +1,105 @@
+"""
+PrimeHaul Leads -- database bootstrap.
+
+Shared startup logic: inspect the database state, bring the schema up to
+date via Alembic, and fall back to ``create_all`` for models not yet
+covered by a migration. Entry-point scripts stay thin wrappers around
+:func:`bootstrap` so there is exactly one copy of this control flow.
+"""
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+
+
+def _alembic_config(database_url: str):
+    from alembic.config import Config
+
+    cfg = Config("alembic.ini")
+    cfg.set_main_option("sqlalchemy.url", database_url)
+    return cfg
+
+
+def _schema_at_head(engine) -> bool:
+    """True if the database is stamped at the latest Alembic revision.
+
+    When it is, every model table is covered by a migration that just
+    ran, so the per-table reflection probes of ``create_all`` are pure
+    overhead. Errs on the side of False so the fallback still runs.
+    """
+    try:
+        from alembic.config import Config
+        from alembic.runtime.migration import MigrationContext
+        from alembic.script import ScriptDirectory
+
+        head = ScriptDirectory.from_config(Config("alembic.ini")).get_current_head()
+        with engine.connect() as conn:
+            current = MigrationContext.configure(conn).get_current_revision()
+        return current is not None and current == head
+    except Exception as e:
+        print(f"Revision check error: {e}")
+        return False
+
+
+def bootstrap(database_url: str, *, create_missing_tables: bool = True) -> None:
+    """Check schema state and run migrations against ``database_url``.
+
+    Args:
+        database_url: Already-normalized SQLAlchemy URL.
+        create_missing_tables: Run ``Base.metadata.create_all`` afterwards
+            to cover models that have no migration yet.
+    """
+    print("Checking database state...")
+    # This engine only runs a couple of read-only checks and exits:
+    # no pool to keep warm, no transaction to open
+    engine = create_engine(
+        database_url,
+        poolclass=NullPool,
+        isolation_level="AUTOCOMMIT",
+        connect_args={"connect_timeout": 5},
+    )
+
+    upgraded = False
+    try:
+        with engine.connect() as conn:
+            # Both flags in one round-trip; to_regclass hits the syscache
+            # instead of scanning information_schema
+            alembic_exists, tables_exist = conn.execute(text(
+                "SELECT (SELECT to_regclass('public.alembic_version') IS NOT NULL), "
+                "(SELECT to_regclass('public.leads') IS NOT NULL)"
+            )).first()
+
+        # In-process Alembic API: no fork/exec of a second interpreter
+        # that would re-import SQLAlchemy and every model
+        from alembic import command
+
+        cfg = _alembic_config(database_url)
+        if tables_exist and not alembic_exists:
+            print("Tables exist but no alembic_version - stamping to latest...")
+            command.stamp(cfg, "head")
+        elif not tables_exist:
+            print("Fresh database - running all migrations...")
+            command.upgrade(cfg, "head")
+            upgraded = True
+        else:
+            print("Running pending migrations...")
+            command.upgrade(cfg, "head")
+            upgraded = True
+
+    except Exception as e:
+        print(f"Database setup error: {e}")
+        print("Attempting to continue anyway...")
+
+    # Ensure all model tables exist (covers new models not yet in Alembic);
+    # skipped only when migrations actually just ran us up to head, since
+    # create_all would then re-reflect every table to decide nothing needs
+    # creating. The stamp branch writes head without running anything, so
+    # a stamped legacy database still gets its missing tables created.
+    if create_missing_tables and not (upgraded and _schema_at_head(engine)):
+        try:
+            from app.models import Base
+            Base.metadata.create_all(engine, checkfirst=True)
+            print("All model tables verified")
+        except Exception as e:
+            print(f"Table creation check error: {e}")
+
+    print("Database ready!")
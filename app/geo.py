@@ -1,5 +1,4 @@
 import math
-import re
 
 
 def validate_coordinates(lat: float, lng: float) -> bool:
@@ -24,6 +23,47 @@ def calculate_distance_miles(lat1: float, lng1: float, lat2: float, lng2: float)
     return R * c
 
 
+def distance_calculator_miles(lat1: float, lng1: float):
+    """Return a ``f(lat2, lng2) -> miles`` function fixed at one origin.
+
+    The origin's radian conversion and cosine are computed once here
+    instead of on every call, so checking many candidate points against
+    the same origin (e.g. lead matching) skips the repeated trig.
+    Behaves exactly like :func:`calculate_distance_miles`, including the
+    0.0 return for out-of-range coordinates.
+    """
+    if not validate_coordinates(lat1, lng1):
+        return lambda lat2, lng2: 0.0
+
+    R = 3959  # Earth radius in miles
+    lat1_r = math.radians(lat1)
+    cos_lat1 = math.cos(lat1_r)
+
+    def _distance(lat2: float, lng2: float) -> float:
+        if not validate_coordinates(lat2, lng2):
+            return 0.0
+        dlat = math.radians(lat2 - lat1)
+        dlng = math.radians(lng2 - lng1)
+        a = math.sin(dlat / 2) ** 2 + cos_lat1 * math.cos(math.radians(lat2)) * math.sin(dlng / 2) ** 2
+        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+        return R * c
+
+    return _distance
+
+
+def bounding_box(lat: float, lng: float, radius_miles: float) -> tuple:
+    """Return (min_lat, max_lat, min_lng, max_lng) enclosing a radius around a point.
+
+    A cheap rectangular prefilter so the database can use an index range
+    scan instead of fetching every row; callers must still run the exact
+    haversine check on the candidates that come back.
+    """
+    lat_delta = radius_miles / 69.0  # ~69 miles per degree of latitude
+    cos_lat = math.cos(math.radians(lat))
+    lng_delta = radius_miles / (69.17 * max(cos_lat, 0.01))
+    return lat - lat_delta, lat + lat_delta, lng - lng_delta, lng + lng_delta
+
+
 def extract_postcode_area(postcode: str) -> str:
     """Extract the outward code from a UK postcode for redacted display.
     'SW1A 2AA' -> 'SW1A', 'M1 1AA' -> 'M1'
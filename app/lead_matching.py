@@ -7,13 +7,20 @@ match the lead characteristics, then sends each company a notification.
 """
 
 import logging
+import math
 from datetime import datetime, timezone
 
-from app.geo import calculate_distance_miles
+from sqlalchemy import func, insert
+
+from app.geo import bounding_box, distance_calculator_miles
 from app.models import Company, Lead, LeadNotification
 
 logger = logging.getLogger("primehaul.matching")
 
+# Mirrors the service-radius cap enforced in company_routes. Used to build
+# the bounding-box prefilter: no company further away than this can match.
+MAX_SERVICE_RADIUS_MILES = 500
+
 
 # ---------------------------------------------------------------------------
 # Core matching logic
@@ -44,43 +51,53 @@ def find_matching_companies(lead, db) -> list:
         )
         return []
 
-    # Fetch all active companies that have a base location configured
+    pickup_lat = float(pickup_lat)
+    pickup_lng = float(pickup_lng)
+    lead_cbm = float(lead.total_cbm or 0)
+
+    # Push as much of the matching as possible into one SQL query:
+    # - global bounding box (index range scan on idx_companies_base_lat_lng)
+    # - per-company box against its own service radius (coarse distance)
+    # - CBM preference window
+    # Only the exact haversine check and the case-insensitive property-type
+    # comparison remain in Python, on a far smaller candidate set.
+    min_lat, max_lat, min_lng, max_lng = bounding_box(
+        pickup_lat, pickup_lng, MAX_SERVICE_RADIUS_MILES
+    )
+    radius = func.coalesce(Company.service_radius_miles, 30)
+    miles_per_lng_degree = 69.17 * max(math.cos(math.radians(pickup_lat)), 0.01)
     companies = (
         db.query(Company)
         .filter(
             Company.is_active.is_(True),
             Company.base_lat.isnot(None),
             Company.base_lng.isnot(None),
+            Company.base_lat.between(min_lat, max_lat),
+            Company.base_lng.between(min_lng, max_lng),
+            func.abs(Company.base_lat - pickup_lat) * 69.0 <= radius,
+            # 5% slack: cos() is taken at the pickup latitude, not the
+            # company's, so widen the box rather than risk excluding a match
+            func.abs(Company.base_lng - pickup_lng) * miles_per_lng_degree
+            <= radius * 1.05,
+            (Company.pref_min_cbm.is_(None)) | (Company.pref_min_cbm <= lead_cbm),
+            (Company.pref_max_cbm.is_(None)) | (Company.pref_max_cbm >= lead_cbm),
         )
         .all()
     )
 
-    lead_cbm = float(lead.total_cbm or 0)
     lead_property_type = (lead.property_type or "").strip()
 
+    # Origin trig is hoisted out of the candidate loop
+    distance_from_pickup = distance_calculator_miles(pickup_lat, pickup_lng)
+
     matched = []
 
     for company in companies:
-        # --- Distance check ---
-        distance = calculate_distance_miles(
-            company.base_lat,
-            company.base_lng,
-            float(pickup_lat),
-            float(pickup_lng),
-        )
-        radius = company.service_radius_miles or 30
-        if distance > radius:
+        # --- Exact distance check on the prefiltered candidates ---
+        distance = distance_from_pickup(company.base_lat, company.base_lng)
+        if distance > (company.service_radius_miles or 30):
             continue
 
-        # --- CBM preference checks ---
-        if company.pref_min_cbm is not None:
-            if lead_cbm < float(company.pref_min_cbm):
-                continue
-
-        if company.pref_max_cbm is not None:
-            if lead_cbm > float(company.pref_max_cbm):
-                continue
-
         # --- Property type preference check ---
         if company.pref_property_types:
             # pref_property_types is a JSONB array, e.g. ["House", "Flat"]
@@ -100,7 +117,7 @@ def find_matching_companies(lead, db) -> list:
         )
 
     logger.info(
-        "Lead %s: %d of %d active companies matched",
+        "Lead %s: %d of %d candidate companies matched",
         lead.id,
         len(matched),
         len(companies),
@@ -172,21 +189,24 @@ def distribute_lead(lead_id, db_session_factory=None):
                 "Failed to send customer confirmation for lead %s", lead_id
             )
 
-        # Distribute to each matching company
+        # Record all notifications in one bulk INSERT (single round-trip
+        # with executemany batching) and commit once, then send the emails.
         now = datetime.now(timezone.utc)
 
-        for company in matching_companies:
-            # Create a notification record
-            notification = LeadNotification(
-                lead_id=lead.id,
-                company_id=company.id,
-                sent_at=now,
-                notification_method="email",
-            )
-            db.add(notification)
+        rows = [
+            {
+                "lead_id": lead.id,
+                "company_id": company.id,
+                "sent_at": now,
+                "notification_method": "email",
+            }
+            for company in matching_companies
+        ]
+        db.execute(insert(LeadNotification), rows)
+        db.commit()
 
-            # Attempt to send the email notification
-            if send_lead_alert_email is not None:
+        if send_lead_alert_email is not None:
+            for company in matching_companies:
                 try:
                     send_lead_alert_email(company, lead)
                 except Exception:
@@ -197,7 +217,6 @@ def distribute_lead(lead_id, db_session_factory=None):
                         lead_id,
                     )
 
-        db.commit()
         logger.info(
             "distribute_lead: Lead %s distributed to %d companies",
             lead_id,
@@ -15,7 +15,6 @@ import random
 import string
 import uuid
 from datetime import datetime, timedelta, timezone
-from decimal import Decimal
 from typing import List, Optional
 
 from fastapi import (
@@ -28,6 +27,7 @@ from fastapi import (
 from fastapi.responses import FileResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from sqlalchemy import case, func
 from sqlalchemy.orm import Session, joinedload
 
 from slowapi import _rate_limit_exceeded_handler
@@ -105,6 +105,35 @@ def _safe_int(val, default=1):
     except (ValueError, TypeError):
         return default
 
+
+def compute_inventory_totals(db: Session, lead_id) -> dict:
+    """Aggregate inventory totals for a lead in a single SQL query.
+
+    Sums quantities, CBM, weight and bulky/fragile counts across all
+    lead_items without loading the item rows into Python. The returned
+    values match the scalar columns stored on the Lead record.
+    """
+    qty = func.coalesce(LeadItem.qty, 1)
+    row = (
+        db.query(
+            func.coalesce(func.sum(qty * func.coalesce(LeadItem.cbm, 0)), 0).label("total_cbm"),
+            func.coalesce(func.sum(qty * func.coalesce(LeadItem.weight_kg, 0)), 0).label("total_weight_kg"),
+            func.coalesce(func.sum(qty), 0).label("total_items"),
+            func.coalesce(func.sum(case((LeadItem.bulky.is_(True), qty), else_=0)), 0).label("bulky_items"),
+            func.coalesce(func.sum(case((LeadItem.fragile.is_(True), qty), else_=0)), 0).label("fragile_items"),
+        )
+        .join(LeadRoom, LeadItem.room_id == LeadRoom.id)
+        .filter(LeadRoom.lead_id == lead_id)
+        .one()
+    )
+    return {
+        "total_cbm": round(float(row.total_cbm or 0), 2),
+        "total_weight_kg": round(float(row.total_weight_kg or 0), 2),
+        "total_items": int(row.total_items or 0),
+        "bulky_items": int(row.bulky_items or 0),
+        "fragile_items": int(row.fragile_items or 0),
+    }
+
 # ---------------------------------------------------------------------------
 # Application factory
 # ---------------------------------------------------------------------------
@@ -197,6 +226,30 @@ def start_social_scheduler():
         replace_existing=True,
     )
 
+    # Refresh the daily revenue materialized view nightly at 2:30am UTC
+    from app.admin_routes import refresh_daily_revenue_view
+
+    _scheduler.add_job(
+        refresh_daily_revenue_view,
+        CronTrigger(hour=2, minute=30),
+        id="revenue_matview_refresh",
+        replace_existing=True,
+    )
+
+    # Drain the transactional outbox (confirmation emails, Stripe
+    # customer pre-provisioning) every minute; the LISTEN/NOTIFY worker
+    # below handles events immediately, this is the safety net
+    from app.outbox import process_outbox_events, start_outbox_listener
+
+    _scheduler.add_job(
+        process_outbox_events,
+        CronTrigger(minute="*"),
+        id="outbox_drain",
+        replace_existing=True,
+    )
+
+    start_outbox_listener()
+
     _scheduler.start()
     logger.info("Social auto-pilot scheduler started")
 
@@ -687,24 +740,7 @@ async def survey_review(token: str, request: Request, db: Session = Depends(get_
     lead = get_lead_or_404(token, db)
 
     # Compute totals for display (not yet persisted -- that happens on POST)
-    total_cbm = Decimal("0")
-    total_weight_kg = Decimal("0")
-    total_items = 0
-    bulky_items = 0
-    fragile_items = 0
-
-    for room in lead.rooms:
-        for item in room.items:
-            qty = item.qty or 1
-            total_items += qty
-            if item.cbm:
-                total_cbm += Decimal(str(item.cbm)) * qty
-            if item.weight_kg:
-                total_weight_kg += Decimal(str(item.weight_kg)) * qty
-            if item.bulky:
-                bulky_items += qty
-            if item.fragile:
-                fragile_items += qty
+    totals = compute_inventory_totals(db, lead.id)
 
     return templates.TemplateResponse(
         "consumer/review.html",
@@ -713,11 +749,7 @@ async def survey_review(token: str, request: Request, db: Session = Depends(get_
             "token": token,
             "lead": lead,
             "rooms": lead.rooms,
-            "total_cbm": round(total_cbm, 2),
-            "total_weight_kg": round(total_weight_kg, 2),
-            "total_items": total_items,
-            "bulky_items": bulky_items,
-            "fragile_items": fragile_items,
+            **totals,
             "progress": PROGRESS["review"],
         },
     )
@@ -729,31 +761,13 @@ async def survey_review_post(
 ):
     lead = get_lead_or_404(token, db)
 
-    # Finalise inventory totals on the lead record
-    total_cbm = Decimal("0")
-    total_weight_kg = Decimal("0")
-    total_items = 0
-    bulky_items = 0
-    fragile_items = 0
-
-    for room in lead.rooms:
-        for item in room.items:
-            qty = item.qty or 1
-            total_items += qty
-            if item.cbm:
-                total_cbm += Decimal(str(item.cbm)) * qty
-            if item.weight_kg:
-                total_weight_kg += Decimal(str(item.weight_kg)) * qty
-            if item.bulky:
-                bulky_items += qty
-            if item.fragile:
-                fragile_items += qty
-
-    lead.total_cbm = total_cbm
-    lead.total_weight_kg = total_weight_kg
-    lead.total_items = total_items
-    lead.bulky_items = bulky_items
-    lead.fragile_items = fragile_items
+    # Finalise inventory totals on the lead record with one aggregate query
+    totals = compute_inventory_totals(db, lead.id)
+    lead.total_cbm = totals["total_cbm"]
+    lead.total_weight_kg = totals["total_weight_kg"]
+    lead.total_items = totals["total_items"]
+    lead.bulky_items = totals["bulky_items"]
+    lead.fragile_items = totals["fragile_items"]
 
     # Generate consumer-facing price estimate
     estimate = calculate_lead_estimate(lead)
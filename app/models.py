@@ -1,3 +1,5 @@
+import secrets
+import time
 import uuid
 from datetime import datetime, timedelta
 
@@ -6,11 +8,29 @@ from sqlalchemy import (
     Numeric, String, Text, func
 )
 from sqlalchemy.dialects.postgresql import JSONB, UUID
-from sqlalchemy.orm import declarative_base, relationship
+from sqlalchemy.orm import declarative_base, relationship, validates
 
 Base = declarative_base()
 
 
+def _uuid7() -> uuid.UUID:
+    """Generate a time-ordered UUIDv7 (RFC 9562 layout).
+
+    Used for insert-heavy tables so new primary keys land on the hot
+    right-hand side of the B-tree instead of scattering random pages
+    the way uuid4 does.
+    """
+    ts_ms = time.time_ns() // 1_000_000
+    value = (
+        ((ts_ms & 0xFFFF_FFFF_FFFF) << 80)  # 48-bit unix timestamp (ms)
+        | (0x7 << 76)                        # version 7
+        | (secrets.randbits(12) << 64)       # rand_a
+        | (0b10 << 62)                       # RFC 4122 variant
+        | secrets.randbits(62)               # rand_b
+    )
+    return uuid.UUID(int=value)
+
+
 # ---------------------------------------------------------------------------
 # Lead (the core survey/quote record)
 # ---------------------------------------------------------------------------
@@ -44,9 +64,10 @@ class Lead(Base):
     customer_email = Column(String(255), index=True)
     customer_phone = Column(String(50))
 
-    # Inventory totals
-    total_cbm = Column(Numeric(10, 2), default=0)
-    total_weight_kg = Column(Numeric(10, 2), default=0)
+    # Inventory totals (Float, not Numeric: measurements need no exact
+    # decimal arithmetic and Float avoids Decimal boxing on every load)
+    total_cbm = Column(Float, default=0)
+    total_weight_kg = Column(Float, default=0)
     total_items = Column(Integer, default=0)
     bulky_items = Column(Integer, default=0)
     fragile_items = Column(Integer, default=0)
@@ -80,6 +101,17 @@ class Lead(Base):
     purchases = relationship("LeadPurchase", back_populates="lead")
     notifications = relationship("LeadNotification", back_populates="lead")
 
+    @validates("pickup", "dropoff")
+    def _coerce_location(self, key, value):
+        """Only dicts (or None) may be assigned to the location fields.
+
+        Guarantees downstream readers can call ``.get()`` without
+        re-checking the shape on every access.
+        """
+        if value is None or isinstance(value, dict):
+            return value
+        raise ValueError(f"{key} must be a dict, got {type(value).__name__}")
+
 
 # ---------------------------------------------------------------------------
 # Lead Rooms
@@ -111,11 +143,11 @@ class LeadItem(Base):
 
     name = Column(String(255), nullable=False)
     qty = Column(Integer, default=1)
-    length_cm = Column(Numeric(10, 2))
-    width_cm = Column(Numeric(10, 2))
-    height_cm = Column(Numeric(10, 2))
-    weight_kg = Column(Numeric(10, 2))
-    cbm = Column(Numeric(10, 4))
+    length_cm = Column(Float)
+    width_cm = Column(Float)
+    height_cm = Column(Float)
+    weight_kg = Column(Float)
+    cbm = Column(Float)
     bulky = Column(Boolean, default=False)
     fragile = Column(Boolean, default=False)
     item_category = Column(String(50))
@@ -149,6 +181,10 @@ class LeadPhoto(Base):
 # ---------------------------------------------------------------------------
 class Company(Base):
     __tablename__ = "companies"
+    __table_args__ = (
+        # Range-scan index for the bounding-box prefilter in lead matching
+        Index("idx_companies_base_lat_lng", "base_lat", "base_lng"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -193,16 +229,26 @@ class LeadPurchase(Base):
     __tablename__ = "lead_purchases"
     __table_args__ = (
         Index("idx_purchase_company_lead", "company_id", "lead_id", unique=True),
+        # Covering index: dashboard revenue/purchase queries read only these
+        # columns, so Postgres can answer with index-only scans
+        Index(
+            "idx_purchase_company_covering",
+            "company_id",
+            postgresql_include=["lead_id", "price_pence", "payment_status", "paid_at"],
+        ),
     )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=_uuid7)
     lead_id = Column(UUID(as_uuid=True), ForeignKey("leads.id"), nullable=False, index=True)
     company_id = Column(UUID(as_uuid=True), ForeignKey("companies.id"), nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     price_pence = Column(Integer, nullable=False)
+    # Denormalized "pickup to dropoff | CBM" snapshot so purchase-history
+    # list views render without joining back to leads
+    summary = Column(String(255))
     stripe_payment_intent_id = Column(String(255), unique=True)
-    stripe_checkout_session_id = Column(String(255))
+    stripe_checkout_session_id = Column(String(255), unique=True, index=True)
     payment_status = Column(String(50), default="pending", index=True)
     paid_at = Column(DateTime(timezone=True))
 
@@ -216,10 +262,16 @@ class LeadPurchase(Base):
 class LeadNotification(Base):
     __tablename__ = "lead_notifications"
     __table_args__ = (
-        Index("idx_notification_company_lead", "company_id", "lead_id"),
+        Index("idx_notification_company_lead", "company_id", "lead_id", unique=True),
+        # Covering index for the company dashboard notification funnel
+        Index(
+            "idx_notification_company_covering",
+            "company_id",
+            postgresql_include=["lead_id", "sent_at", "opened_at", "purchased_at"],
+        ),
     )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=_uuid7)
     lead_id = Column(UUID(as_uuid=True), ForeignKey("leads.id"), nullable=False, index=True)
     company_id = Column(UUID(as_uuid=True), ForeignKey("companies.id"), nullable=False, index=True)
     sent_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -302,7 +354,7 @@ class EmailLog(Base):
 class StripeEvent(Base):
     __tablename__ = "stripe_events"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=_uuid7)
     stripe_event_id = Column(String(255), nullable=False, unique=True, index=True)
     event_type = Column(String(100), nullable=False, index=True)
     payload = Column(JSONB, nullable=False)
@@ -310,6 +362,21 @@ class StripeEvent(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 
+# ---------------------------------------------------------------------------
+# Outbox Events (transactional side-effect queue)
+# ---------------------------------------------------------------------------
+class OutboxEvent(Base):
+    __tablename__ = "outbox_events"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=_uuid7)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    kind = Column(String(50), nullable=False, index=True)  # purchase_confirmation/ensure_stripe_customer
+    payload = Column(JSONB)  # handler-specific ids, e.g. {lead_id, company_id}
+    processed_at = Column(DateTime(timezone=True), index=True)
+    attempts = Column(Integer, default=0)
+    last_error = Column(Text)
+
+
 # ---------------------------------------------------------------------------
 # Social Media Automation
 # ---------------------------------------------------------------------------
@@ -355,6 +422,7 @@ class SocialPost(Base):
     platform_post_id = Column(String(255))
     engagement = Column(JSONB)  # {likes, comments, shares, impressions}
     error_message = Column(Text)
+    retry_count = Column(Integer, default=0)  # transient publish failures so far
 
 
 class SocialAccount(Base):
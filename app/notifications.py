@@ -6,6 +6,7 @@ via SMTP. Silently degrades when SMTP is not configured (dev mode).
 All emails are logged to the email_logs table for admin visibility.
 """
 
+import html
 import logging
 import smtplib
 from datetime import datetime, timezone
@@ -16,6 +17,11 @@ from app.config import settings
 
 logger = logging.getLogger("primehaul.notifications")
 
+# Evaluated once at import -- SMTP config comes from env vars and does not
+# change at runtime. Lets the send_* functions skip rendering the full HTML
+# body when emails would only be logged as skipped anyway (dev/test mode).
+_SMTP_ENABLED = bool(settings.SMTP_HOST and settings.SMTP_USERNAME)
+
 # ---------------------------------------------------------------------------
 # Brand constants
 # ---------------------------------------------------------------------------
@@ -36,9 +42,9 @@ def _base_style() -> str:
     ).format(text=TEXT_COLOR)
 
 
-def _wrap_html(inner_html: str) -> str:
-    """Wrap content in a branded email shell with header and footer."""
-    return f"""\
+# Static shell fragments, interpolated once at import -- every brand value
+# is a module constant, so per-email work reduces to one str.join.
+_HTML_HEAD = f"""\
 <!DOCTYPE html>
 <html lang="en">
 <head><meta charset="utf-8"><meta name="viewport" content="width=device-width, initial-scale=1.0"></head>
@@ -59,7 +65,9 @@ def _wrap_html(inner_html: str) -> str:
       <!-- Body -->
       <tr>
         <td style="padding: 32px;">
-          {inner_html}
+          """
+
+_HTML_TAIL = f"""
         </td>
       </tr>
       <!-- Footer -->
@@ -77,26 +85,49 @@ def _wrap_html(inner_html: str) -> str:
 </html>"""
 
 
+def _wrap_html(inner_html: str) -> str:
+    """Wrap content in a branded email shell with header and footer."""
+    return "".join((_HTML_HEAD, inner_html, _HTML_TAIL))
+
+
+# Call-to-action button fragments around the two dynamic values (url, label)
+_CTA_PRE = (
+    '<table role="presentation" cellpadding="0" cellspacing="0" '
+    'style="margin: 24px 0;"><tr><td style="border-radius:6px; '
+    f'background-color:{BRAND_COLOR};">'
+    '<a href="'
+)
+_CTA_MID = (
+    '" target="_blank" '
+    'style="display:inline-block; padding:14px 32px; color:#ffffff; '
+    "text-decoration:none; font-size:16px; font-weight:600; "
+    'border-radius:6px;">'
+)
+_CTA_POST = "</a></td></tr></table>"
+
+
 def _cta_button(url: str, label: str) -> str:
     """Generate an inline-styled call-to-action button."""
-    return (
-        f'<table role="presentation" cellpadding="0" cellspacing="0" '
-        f'style="margin: 24px 0;"><tr><td style="border-radius:6px; '
-        f"background-color:{BRAND_COLOR};\">"
-        f'<a href="{url}" target="_blank" '
-        f'style="display:inline-block; padding:14px 32px; color:#ffffff; '
-        f"text-decoration:none; font-size:16px; font-weight:600; "
-        f'border-radius:6px;">{label}</a>'
-        f"</td></tr></table>"
-    )
+    return "".join((_CTA_PRE, url, _CTA_MID, label, _CTA_POST))
+
+
+# Precompiled row template -- the wrapper HTML is static, only the label
+# and value change per call (6-8 calls per email)
+_INFO_ROW_TPL = (
+    '<tr><td style="padding:6px 12px 6px 0; font-weight:600; '
+    f'color:{MUTED_COLOR}; white-space:nowrap; vertical-align:top;">'
+    '{label}</td><td style="padding:6px 0;">{value}</td></tr>'
+)
 
 
 def _info_row(label: str, value: str) -> str:
-    """A single key-value row for data tables in emails."""
-    return (
-        f'<tr><td style="padding:6px 12px 6px 0; font-weight:600; '
-        f'color:{MUTED_COLOR}; white-space:nowrap; vertical-align:top;">'
-        f'{label}</td><td style="padding:6px 0;">{value}</td></tr>'
+    """A single key-value row for data tables in emails.
+
+    The label is always a trusted literal; the value can contain
+    customer-supplied text (names, address labels) and is escaped.
+    """
+    return _INFO_ROW_TPL.format_map(
+        {"label": label, "value": html.escape(str(value), quote=False)}
     )
 
 
@@ -164,6 +195,24 @@ def _log_email(
         logger.exception("[EMAIL-LOG] Failed to write email log entry")
 
 
+def _skip_email(to_email: str, subject: str, email_type: str, **ids):
+    """Record a skipped email without rendering its HTML body.
+
+    Called by the send_* functions when SMTP is disabled so the admin
+    email log still shows what would have been sent.
+    """
+    logger.info(
+        "[EMAIL] SMTP not configured. Would send to %s: %s", to_email, subject
+    )
+    _log_email(
+        to_email=to_email,
+        subject=subject,
+        email_type=email_type,
+        status="skipped",
+        **ids,
+    )
+
+
 # ---------------------------------------------------------------------------
 # Core email sender
 # ---------------------------------------------------------------------------
@@ -224,11 +273,22 @@ def send_customer_confirmation(lead):
     if not lead.customer_email:
         return
 
+    if not _SMTP_ENABLED:
+        _skip_email(
+            lead.customer_email,
+            "Your PrimeHaul moving quote request has been received",
+            "customer_confirmation",
+            lead_id=lead.id,
+        )
+        return
+
+    pickup_area = _pickup_area(lead)
+    dropoff_area = _dropoff_area(lead)
     move_date_str = (
         lead.move_date.strftime("%A %d %B %Y") if lead.move_date else "Not specified"
     )
     estimate_str = (
-        f"\u00a3{lead.estimate_low:,} &ndash; \u00a3{lead.estimate_high:,}"
+        f"\u00a3{lead.estimate_low:,} \u2013 \u00a3{lead.estimate_high:,}"
         if lead.estimate_low and lead.estimate_high
         else "Pending"
     )
@@ -247,8 +307,8 @@ def send_customer_confirmation(lead):
 <table role="presentation" cellpadding="0" cellspacing="0"
        style="width:100%; border:1px solid #e8e8e8; border-radius:6px;
               margin-bottom:20px;">
-  {_info_row("Pickup area", _pickup_area(lead))}
-  {_info_row("Drop-off area", _dropoff_area(lead))}
+  {_info_row("Pickup area", pickup_area)}
+  {_info_row("Drop-off area", dropoff_area)}
   {_info_row("Move date", move_date_str)}
   {_info_row("Estimated cost", estimate_str)}
   {_info_row("Total volume", f"{lead.total_cbm or 0} CBM")}
@@ -278,14 +338,29 @@ def send_lead_alert_email(company, lead):
     if not notification_email:
         return
 
+    # Computed once and reused in both subject and body -- these run per
+    # company during a fan-out, so avoid re-probing the same lead dicts
+    pickup_area = _pickup_area(lead)
+    dropoff_area = _dropoff_area(lead)
+    total_cbm = lead.total_cbm or 0
     move_date_str = (
         lead.move_date.strftime("%A %d %B %Y") if lead.move_date else "Flexible"
     )
     estimate_str = (
-        f"\u00a3{lead.estimate_low:,} &ndash; \u00a3{lead.estimate_high:,}"
+        f"\u00a3{lead.estimate_low:,} \u2013 \u00a3{lead.estimate_high:,}"
         if lead.estimate_low and lead.estimate_high
         else "Pending"
     )
+    if not _SMTP_ENABLED:
+        _skip_email(
+            notification_email,
+            f"New lead: {pickup_area} to {dropoff_area} ({total_cbm} CBM)",
+            "lead_alert",
+            lead_id=lead.id,
+            company_id=company.id,
+        )
+        return
+
     lead_price_str = _format_price_pounds(lead.lead_price_pence)
     app_url = settings.APP_URL.rstrip("/")
     preview_url = f"{app_url}/company/leads/{lead.id}/preview"
@@ -301,10 +376,10 @@ def send_lead_alert_email(company, lead):
 <table role="presentation" cellpadding="0" cellspacing="0"
        style="width:100%; border:1px solid #e8e8e8; border-radius:6px;
               margin-bottom:20px;">
-  {_info_row("Pickup area", _pickup_area(lead))}
-  {_info_row("Drop-off area", _dropoff_area(lead))}
+  {_info_row("Pickup area", pickup_area)}
+  {_info_row("Drop-off area", dropoff_area)}
   {_info_row("Property type", lead.property_type or "Not specified")}
-  {_info_row("Volume", f"{lead.total_cbm or 0} CBM")}
+  {_info_row("Volume", f"{total_cbm} CBM")}
   {_info_row("Total items", str(lead.total_items or 0))}
   {_info_row("Estimated value", estimate_str)}
   {_info_row("Move date", move_date_str)}
@@ -324,7 +399,7 @@ def send_lead_alert_email(company, lead):
 
     _send_email(
         to_email=notification_email,
-        subject=f"New lead: {_pickup_area(lead)} to {_dropoff_area(lead)} ({lead.total_cbm or 0} CBM)",
+        subject=f"New lead: {pickup_area} to {dropoff_area} ({total_cbm} CBM)",
         html_body=_wrap_html(inner),
         email_type="lead_alert",
         lead_id=lead.id,
@@ -342,6 +417,19 @@ def send_purchase_confirmation(company, lead):
     if not notification_email:
         return
 
+    pickup_area = _pickup_area(lead)
+    dropoff_area = _dropoff_area(lead)
+
+    if not _SMTP_ENABLED:
+        _skip_email(
+            notification_email,
+            f"Lead purchased: {lead.customer_name or 'Customer'} - {pickup_area} to {dropoff_area}",
+            "purchase_confirmation",
+            lead_id=lead.id,
+            company_id=company.id,
+        )
+        return
+
     move_date_str = (
         lead.move_date.strftime("%A %d %B %Y") if lead.move_date else "Flexible"
     )
@@ -395,7 +483,7 @@ def send_purchase_confirmation(company, lead):
 
     _send_email(
         to_email=notification_email,
-        subject=f"Lead purchased: {lead.customer_name or 'Customer'} - {_pickup_area(lead)} to {_dropoff_area(lead)}",
+        subject=f"Lead purchased: {lead.customer_name or 'Customer'} - {pickup_area} to {dropoff_area}",
         html_body=_wrap_html(inner),
         email_type="purchase_confirmation",
         lead_id=lead.id,
@@ -411,6 +499,15 @@ def send_manual_email(
     sent_by_admin_id=None,
 ):
     """Send a manual email composed from the admin dashboard."""
+    if not _SMTP_ENABLED:
+        _skip_email(
+            to_email,
+            subject,
+            "manual",
+            sent_by_admin_id=sent_by_admin_id,
+        )
+        return
+
     _send_email(
         to_email=to_email,
         subject=subject,
@@ -0,0 +1,179 @@
+"""
+PrimeHaul Leads -- transactional outbox.
+
+Side effects that follow a database state change (confirmation emails,
+Stripe customer pre-provisioning) are recorded as ``outbox_events`` rows
+in the same transaction as the change, then executed by a background
+worker. The side effect happens iff the transaction commits, and the
+enqueuing request never pays the SMTP/Stripe latency itself.
+"""
+
+import logging
+import select
+import threading
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models import Company, Lead, OutboxEvent
+
+logger = logging.getLogger("primehaul.outbox")
+
+# Give up on an event after this many failed attempts
+MAX_ATTEMPTS = 5
+
+
+def enqueue_outbox_event(db: Session, kind: str, payload: dict) -> None:
+    """Queue a side effect inside the caller's transaction (no commit)."""
+    db.execute(insert(OutboxEvent).values(kind=kind, payload=payload))
+
+
+# ---------------------------------------------------------------------------
+# Handlers
+# ---------------------------------------------------------------------------
+def _handle_purchase_confirmation(db: Session, payload: dict) -> None:
+    from app.notifications import send_purchase_confirmation
+
+    company = db.query(Company).filter(Company.id == payload.get("company_id")).first()
+    lead = db.query(Lead).filter(Lead.id == payload.get("lead_id")).first()
+    if company and lead:
+        send_purchase_confirmation(company, lead)
+
+
+def _handle_ensure_stripe_customer(db: Session, payload: dict) -> None:
+    from app.stripe_billing import ensure_stripe_customer
+
+    company = db.query(Company).filter(Company.id == payload.get("company_id")).first()
+    if company:
+        ensure_stripe_customer(company, db)
+
+
+_HANDLERS = {
+    "purchase_confirmation": _handle_purchase_confirmation,
+    "ensure_stripe_customer": _handle_ensure_stripe_customer,
+}
+
+
+# ---------------------------------------------------------------------------
+# Worker
+# ---------------------------------------------------------------------------
+def process_outbox_events(limit: int = 20) -> int:
+    """Execute pending outbox events. Returns the number handled.
+
+    On Postgres the pending rows are claimed FOR UPDATE SKIP LOCKED, so
+    several workers can drain the queue without double-sending.
+    """
+    db = SessionLocal()
+    handled = 0
+    try:
+        query = (
+            db.query(OutboxEvent)
+            .filter(
+                OutboxEvent.processed_at.is_(None),
+                OutboxEvent.attempts < MAX_ATTEMPTS,
+            )
+            .order_by(OutboxEvent.created_at)
+            .limit(limit)
+        )
+        if db.get_bind().dialect.name == "postgresql":
+            query = query.with_for_update(skip_locked=True)
+        events = query.all()
+
+        for event in events:
+            handler = _HANDLERS.get(event.kind)
+            if handler is None:
+                event.processed_at = datetime.now(timezone.utc)
+                event.last_error = f"Unknown outbox kind: {event.kind}"
+                logger.error("Unknown outbox kind %s for event %s", event.kind, event.id)
+                continue
+
+            event.attempts = (event.attempts or 0) + 1
+            # Handlers get their own session: a commit inside one (e.g.
+            # ensure_stripe_customer) must not end the transaction that
+            # holds the SKIP LOCKED claims, or a concurrent drain could
+            # re-claim the rest of the batch and double-send.
+            handler_db = SessionLocal()
+            try:
+                handler(handler_db, event.payload or {})
+                handler_db.commit()
+            except Exception as e:
+                handler_db.rollback()
+                event.last_error = str(e)
+                logger.exception("Outbox event %s (%s) failed", event.id, event.kind)
+                continue
+            finally:
+                handler_db.close()
+
+            event.processed_at = datetime.now(timezone.utc)
+            event.last_error = None
+            handled += 1
+
+        db.commit()
+        return handled
+
+    except Exception:
+        db.rollback()
+        logger.exception("Outbox processing failed")
+        return handled
+    finally:
+        db.close()
+
+
+# ---------------------------------------------------------------------------
+# LISTEN/NOTIFY listener
+# ---------------------------------------------------------------------------
+# An outbox_notify trigger fires pg_notify('outbox', ...) after every
+# insert, so events are dispatched the moment the enqueuing transaction
+# commits instead of waiting for the next scheduled drain. The periodic
+# drain stays in place as a safety net for notifications missed while
+# the listener reconnects.
+
+def _listen_loop() -> None:
+    from app.database import engine
+
+    raw = engine.raw_connection()
+    try:
+        conn = raw.driver_connection
+        conn.autocommit = True
+        if callable(getattr(conn, "notifies", None)):
+            # psycopg3: notifies() is a blocking generator
+            conn.execute("LISTEN outbox")
+            for _ in conn.notifies():
+                process_outbox_events()
+        else:
+            # psycopg2: wait on the socket and drain the notify list
+            cur = conn.cursor()
+            cur.execute("LISTEN outbox")
+            while True:
+                if select.select([conn], [], [], 60) != ([], [], []):
+                    conn.poll()
+                    if conn.notifies:
+                        del conn.notifies[:]
+                        process_outbox_events()
+    finally:
+        raw.close()
+
+
+def _listen_forever() -> None:
+    while True:
+        try:
+            _listen_loop()
+        except Exception:
+            logger.exception("Outbox listener failed -- reconnecting in 10s")
+            time.sleep(10)
+
+
+def start_outbox_listener() -> None:
+    """Start the NOTIFY-driven outbox worker thread (Postgres only).
+
+    On other dialects the periodic scheduler drain is the only driver.
+    """
+    from app.database import engine
+
+    if engine is None or engine.dialect.name != "postgresql":
+        return
+    threading.Thread(target=_listen_forever, name="outbox-listener", daemon=True).start()
+    logger.info("Outbox LISTEN/NOTIFY worker started")
@@ -16,7 +16,10 @@ This module contains two *intentionally separate* pricing systems:
 
 The two systems serve different audiences and should remain decoupled.
 """
-from decimal import Decimal
+import hashlib
+import json
+from collections import OrderedDict
+
 from app.geo import calculate_distance_miles
 
 # Fixed platform pricing (UK averages)
@@ -44,6 +47,32 @@ OUTDOOR_PATH_FEE = 20
 LOW_MULTIPLIER = 0.85
 HIGH_MULTIPLIER = 1.25
 
+# Bounded in-process cache for calculate_lead_estimate. The estimate is a
+# pure function of the lead's pricing inputs, so entries never go stale --
+# the key is a hash of the inputs themselves. Oldest entries are evicted
+# once the cache is full.
+_ESTIMATE_CACHE: OrderedDict = OrderedDict()
+_ESTIMATE_CACHE_MAX = 1024
+
+
+def _estimate_cache_key(lead) -> str:
+    """Hash the pricing-relevant lead fields into a short cache key."""
+    payload = json.dumps(
+        [
+            str(lead.total_cbm or 0),
+            str(lead.total_weight_kg or 0),
+            lead.bulky_items or 0,
+            lead.fragile_items or 0,
+            lead.pickup,
+            lead.dropoff,
+            lead.pickup_access,
+            lead.dropoff_access,
+        ],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
 
 def _access_cost(access_data: dict) -> float:
     """Calculate access difficulty surcharges from JSONB access data."""
@@ -86,9 +115,23 @@ def calculate_lead_estimate(lead) -> dict:
     """
     Calculate a consumer-facing price estimate range.
     Returns dict with estimate_low, estimate_high, and breakdown.
+
+    Results are memoized on a hash of the pricing inputs, so repeat views
+    of the same lead (estimate page refreshes, company previews) skip the
+    distance and access recomputation.
     """
-    total_cbm = float(lead.total_cbm or 0)
-    total_weight = float(lead.total_weight_kg or 0)
+    cache_key = _estimate_cache_key(lead)
+    cached = _ESTIMATE_CACHE.get(cache_key)
+    if cached is not None:
+        _ESTIMATE_CACHE.move_to_end(cache_key)
+        return cached
+    return _compute_estimate(lead, cache_key)
+
+
+def _compute_estimate(lead, cache_key: str) -> dict:
+    """Do the actual estimate maths and store the result under ``cache_key``."""
+    total_cbm = lead.total_cbm or 0
+    total_weight = lead.total_weight_kg or 0
     bulky_count = lead.bulky_items or 0
     fragile_count = lead.fragile_items or 0
 
@@ -114,7 +157,9 @@ def calculate_lead_estimate(lead) -> dict:
         pickup_lng = lead.pickup.get("lng")
         dropoff_lat = lead.dropoff.get("lat")
         dropoff_lng = lead.dropoff.get("lng")
-        if all([pickup_lat, pickup_lng, dropoff_lat, dropoff_lng]):
+        # Explicit None check: 0.0 is a valid coordinate and must not be
+        # treated as "missing" the way a truthiness test would
+        if None not in (pickup_lat, pickup_lng, dropoff_lat, dropoff_lng):
             miles = calculate_distance_miles(pickup_lat, pickup_lng, dropoff_lat, dropoff_lng)
             if miles > FREE_MILES:
                 distance_cost = (miles - FREE_MILES) * PRICE_PER_MILE
@@ -128,7 +173,7 @@ def calculate_lead_estimate(lead) -> dict:
     estimate_low = max(int(total * LOW_MULTIPLIER), 150)
     estimate_high = int(total * HIGH_MULTIPLIER)
 
-    return {
+    result = {
         "estimate_low": estimate_low,
         "estimate_high": estimate_high,
         "breakdown": {
@@ -143,6 +188,31 @@ def calculate_lead_estimate(lead) -> dict:
         },
     }
 
+    _ESTIMATE_CACHE[cache_key] = result
+    if len(_ESTIMATE_CACHE) > _ESTIMATE_CACHE_MAX:
+        _ESTIMATE_CACHE.popitem(last=False)
+    return result
+
+
+def calculate_lead_estimates(leads) -> list:
+    """Batch variant of :func:`calculate_lead_estimate` for list views.
+
+    Returns one estimate dict per lead, in order. Identical pricing
+    inputs are computed once per batch: the cache key doubles as a
+    dedup key, so a page of leads sharing a route or access profile
+    pays for the distance and access maths a single time.
+    """
+    results = []
+    for lead in leads:
+        key = _estimate_cache_key(lead)
+        estimate = _ESTIMATE_CACHE.get(key)
+        if estimate is not None:
+            _ESTIMATE_CACHE.move_to_end(key)
+        else:
+            estimate = _compute_estimate(lead, key)
+        results.append(estimate)
+    return results
+
 
 def calculate_lead_price_pence(total_cbm: float, db) -> int:
     """Determine lead price in pence. Flat rate: £15 per lead."""
@@ -6,11 +6,17 @@ publishes to Facebook, Instagram, X (Twitter), and LinkedIn on a schedule,
 and tracks engagement metrics.
 """
 
+import functools
 import io
+import itertools
 import json
 import logging
 import random
+import secrets
 import textwrap
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
@@ -105,11 +111,34 @@ PLATFORM_SPECS = {
     "x": {"max_chars": 275, "hashtag_count": 3, "tone": "punchy and concise"},
     "linkedin": {"max_chars": 1300, "hashtag_count": 5, "tone": "professional yet approachable"},
 }
+_PLATFORM_SPEC_FALLBACK = PLATFORM_SPECS["facebook"]
+
+# Flat label lookup so callers don't chain .get() through the pillar dicts
+_PILLAR_LABELS = {key: pillar["label"] for key, pillar in B2C_CONTENT_PILLARS.items()}
+
+# Re-queue attempts before a transiently failing post is marked failed
+MAX_PUBLISH_RETRIES = 5
+
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
+class TransientPublishError(Exception):
+    """A platform rejected a publish with a retryable error (429/5xx).
+
+    Lets the scheduler re-queue the post with backoff instead of
+    discarding the generated content and marking it failed.
+    """
+
+
+def _raise_if_transient(exc: httpx.HTTPStatusError, platform: str) -> None:
+    """Re-raise rate limits and server errors as TransientPublishError."""
+    status = exc.response.status_code
+    if status == 429 or status >= 500:
+        raise TransientPublishError(f"{platform} returned HTTP {status}") from exc
+
+
 def _get_config(db: Session) -> SocialConfig:
     """Get or create the singleton social config row."""
     config = db.query(SocialConfig).first()
@@ -121,46 +150,136 @@ def _get_config(db: Session) -> SocialConfig:
     return config
 
 
-def _pick_content_type(config: SocialConfig) -> str:
-    """Weighted random selection of content type based on config mix."""
-    mix = config.content_mix or {"tip": 30, "stat": 25, "promo": 25, "seasonal": 10, "relatable": 10}
-    types = list(mix.keys())
-    weights = [mix[t] for t in types]
-    return random.choices(types, weights=weights, k=1)[0]
+_DEFAULT_CONTENT_MIX = {"tip": 30, "stat": 25, "promo": 25, "seasonal": 10, "relatable": 10}
 
+# Last (mix identity, types, cumulative weights) seen by _pick_content_type.
+# One entry suffices — there is a single config row per process.
+_content_mix_cache: Tuple[int, List[str], List[int]] = (0, [], [])
 
-def _get_font(size: int) -> ImageFont.FreeTypeFont:
-    """Try to load a clean sans-serif font, fall back to default."""
-    font_candidates = [
+
+def _pick_content_type(config: SocialConfig) -> str:
+    """Weighted random selection of content type based on config mix."""
+    global _content_mix_cache
+    mix = config.content_mix or _DEFAULT_CONTENT_MIX
+    cached_id, types, cum_weights = _content_mix_cache
+    if cached_id != id(mix):
+        types = list(mix.keys())
+        cum_weights = list(itertools.accumulate(mix[t] for t in types))
+        _content_mix_cache = (id(mix), types, cum_weights)
+    # Passing cum_weights lets random.choices bisect directly instead of
+    # re-accumulating the weights on every call
+    return random.choices(types, cum_weights=cum_weights, k=1)[0]
+
+
+# Resolve the winning font path once at import instead of probing the
+# candidate list (including the inapplicable platform's paths) per load
+_REGULAR_FONT_PATH = next(
+    (p for p in [
         "C:/Windows/Fonts/segoeui.ttf",
         "C:/Windows/Fonts/arial.ttf",
         "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
         "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
-    ]
-    for path in font_candidates:
+    ] if Path(p).exists()),
+    None,
+)
+_BOLD_FONT_PATH = next(
+    (p for p in [
+        "C:/Windows/Fonts/segoeuib.ttf",
+        "C:/Windows/Fonts/arialbd.ttf",
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+        "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf",
+    ] if Path(p).exists()),
+    None,
+)
+
+
+@functools.lru_cache(maxsize=32)
+def _get_font(size: int) -> ImageFont.FreeTypeFont:
+    """Load the resolved sans-serif font, fall back to default.
+
+    Cached per size: every image render uses the same handful of sizes,
+    and each truetype() call re-parses the font file otherwise.
+    """
+    if _REGULAR_FONT_PATH:
         try:
-            return ImageFont.truetype(path, size)
+            return ImageFont.truetype(_REGULAR_FONT_PATH, size)
         except (OSError, IOError):
-            continue
+            pass
     return ImageFont.load_default()
 
 
+@functools.lru_cache(maxsize=32)
 def _get_bold_font(size: int) -> ImageFont.FreeTypeFont:
-    """Try to load a bold sans-serif font."""
-    font_candidates = [
-        "C:/Windows/Fonts/segoeuib.ttf",
-        "C:/Windows/Fonts/arialbd.ttf",
-        "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
-        "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf",
-    ]
-    for path in font_candidates:
+    """Load the resolved bold sans-serif font. Cached per size."""
+    if _BOLD_FONT_PATH:
         try:
-            return ImageFont.truetype(path, size)
+            return ImageFont.truetype(_BOLD_FONT_PATH, size)
         except (OSError, IOError):
-            continue
+            pass
     return _get_font(size)
 
 
+# ---------------------------------------------------------------------------
+# API client singletons
+# ---------------------------------------------------------------------------
+# OpenAI and tweepy clients each carry an httpx/requests connection pool;
+# rebuilding them per call re-pays the TLS handshake. Cache them at module
+# scope (keyed by credentials for tweepy so token rotation still works).
+_openai_client: Optional[OpenAI] = None
+_client_lock = threading.Lock()
+
+# Shared HTTP client for the Graph/LinkedIn calls. The module-level
+# httpx.post/get helpers open and tear down a TCP+TLS connection per
+# call; one Client keeps connections to the repeatedly-hit hosts alive,
+# and httpx.Client is safe to share across the publisher threads.
+# (HTTP/2 multiplexing would help further, but the h2 extra is not a
+# project dependency.)
+_http = httpx.Client(
+    limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+)
+_x_clients: Dict[tuple, tweepy.Client] = {}
+_x_apis: Dict[tuple, tweepy.API] = {}
+
+
+def _get_openai() -> OpenAI:
+    """Lazy module-level OpenAI client, reused across calls."""
+    global _openai_client
+    if _openai_client is None:
+        with _client_lock:
+            if _openai_client is None:
+                _openai_client = OpenAI(api_key=settings.OPENAI_API_KEY)
+    return _openai_client
+
+
+def _get_x_client() -> tweepy.Client:
+    """Cached tweepy v2 client keyed by the current credential set."""
+    key = (settings.X_API_KEY, settings.X_API_SECRET,
+           settings.X_ACCESS_TOKEN, settings.X_ACCESS_TOKEN_SECRET)
+    client = _x_clients.get(key)
+    if client is None:
+        client = tweepy.Client(
+            consumer_key=key[0],
+            consumer_secret=key[1],
+            access_token=key[2],
+            access_token_secret=key[3],
+        )
+        _x_clients[key] = client
+    return client
+
+
+def _get_x_api_v1() -> tweepy.API:
+    """Cached tweepy v1.1 API (media upload) keyed by credentials."""
+    key = (settings.X_API_KEY, settings.X_API_SECRET,
+           settings.X_ACCESS_TOKEN, settings.X_ACCESS_TOKEN_SECRET)
+    api = _x_apis.get(key)
+    if api is None:
+        auth = tweepy.OAuthHandler(key[0], key[1])
+        auth.set_access_token(key[2], key[3])
+        api = tweepy.API(auth)
+        _x_apis[key] = api
+    return api
+
+
 # ---------------------------------------------------------------------------
 # Content Generation (OpenAI)
 # ---------------------------------------------------------------------------
@@ -179,24 +298,30 @@ def _build_utm_link(city_slug: Optional[str] = None, platform: str = "social") -
     return f"{base}/start?utm_source={platform}&utm_medium=social&utm_campaign=autopilot"
 
 
-def generate_post_content(
+def generate_post_content_multi(
     content_type: str,
-    platform: str,
+    platforms: List[str],
     config: Optional[SocialConfig] = None,
     geo_target: Optional[Dict[str, str]] = None,
-) -> Dict[str, str]:
+) -> Dict[str, Dict[str, str]]:
     """
-    Use OpenAI to generate a social media post.
+    Use OpenAI to generate one post per platform in a single completion.
 
-    Returns: {"caption": "...", "hashtags": "...", "headline": "...", "link": "..."}
+    All variants cover the same topic, so asking for a JSON object keyed
+    by platform amortises the network + inference round-trip that a
+    per-platform call would pay four times over.
+
+    Returns: {platform: {"caption": "...", "hashtags": "...", "headline": "...", "link": "..."}}
     """
+    empty = {p: {"caption": "", "hashtags": "", "headline": "", "link": ""} for p in platforms}
     if not settings.OPENAI_API_KEY:
         logger.warning("OPENAI_API_KEY not set — skipping content generation")
-        return {"caption": "", "hashtags": "", "headline": "", "link": ""}
+        return empty
+    if not platforms:
+        return empty
 
     pillar = B2C_CONTENT_PILLARS.get(content_type, B2C_CONTENT_PILLARS["tip"])
     topic_prompt = random.choice(pillar["prompts"])
-    spec = PLATFORM_SPECS.get(platform, PLATFORM_SPECS["facebook"])
     tone = config.tone if config and config.tone else "friendly_professional"
 
     # Geo-targeted content: substitute {city} in prompt
@@ -207,7 +332,7 @@ def generate_post_content(
         city_slug = geo_target["slug"]
         topic_prompt = topic_prompt.replace("{city}", city_name)
 
-    link = _build_utm_link(city_slug, platform)
+    links = {p: _build_utm_link(city_slug, p) for p in platforms}
 
     system_msg = (
         "You are a social media copywriter for PrimeHaul, a UK-based service that gives "
@@ -215,30 +340,37 @@ def generate_post_content(
         f"slightly witty. The tone should be: {tone.replace('_', ' ')}."
     )
 
+    platform_sections = []
+    for platform in platforms:
+        spec = PLATFORM_SPECS.get(platform) or _PLATFORM_SPEC_FALLBACK
+        platform_sections.append(
+            f"{platform}:\n"
+            f"- Max {spec['max_chars']} characters for the caption\n"
+            f"- Include {spec['hashtag_count']} relevant hashtags\n"
+            f"- Tone: {spec['tone']}\n"
+            f"- Include the link: {links[platform]}\n"
+        )
+
     city_instruction = ""
     if city_name:
-        city_instruction = (
-            f"- Mention {city_name} naturally in the post (for local SEO)\n"
-            f"- Include the link: {link}\n"
-        )
-    else:
-        city_instruction = f"- Include the link: {link}\n"
+        city_instruction = f"- Mention {city_name} naturally in each post (for local SEO)\n"
 
+    platform_keys = ", ".join(f'"{p}": {{...}}' for p in platforms)
     user_msg = (
-        f"Write a {platform} post about {topic_prompt}.\n\n"
-        f"Requirements:\n"
-        f"- Max {spec['max_chars']} characters for the caption\n"
-        f"- Include {spec['hashtag_count']} relevant hashtags\n"
-        f"- Tone: {spec['tone']}\n"
+        f"Write one post per platform about {topic_prompt}.\n\n"
+        f"Per-platform requirements:\n\n"
+        + "\n".join(platform_sections)
+        + f"\nShared requirements:\n"
         f"- Include a subtle CTA mentioning free AI moving quotes from PrimeHaul\n"
         f"{city_instruction}"
         f"- UK English spelling\n\n"
-        f"Respond in JSON format:\n"
+        f"Respond with a JSON object keyed by platform: {{{platform_keys}}}\n"
+        f"Each value must be of the form:\n"
         f'{{"caption": "...", "hashtags": "#tag1 #tag2 ...", "headline": "short 5-8 word headline for the image card"}}'
     )
 
     try:
-        client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        client = _get_openai()
         resp = client.chat.completions.create(
             model="gpt-4o-mini",
             messages=[
@@ -247,51 +379,96 @@ def generate_post_content(
             ],
             response_format={"type": "json_object"},
             temperature=0.85,
-            max_tokens=500,
+            max_tokens=500 * len(platforms),
         )
         data = json.loads(resp.choices[0].message.content)
-        return {
-            "caption": data.get("caption", ""),
-            "hashtags": data.get("hashtags", ""),
-            "headline": data.get("headline", ""),
-            "link": link,
-        }
+        result = {}
+        for platform in platforms:
+            variant = data.get(platform) or {}
+            result[platform] = {
+                "caption": variant.get("caption", ""),
+                "hashtags": variant.get("hashtags", ""),
+                "headline": variant.get("headline", ""),
+                "link": links[platform],
+            }
+        return result
     except Exception as e:
         logger.error(f"OpenAI content generation failed: {e}")
-        return {"caption": "", "hashtags": "", "headline": "", "link": ""}
+        return empty
+
+
+def generate_post_content(
+    content_type: str,
+    platform: str,
+    config: Optional[SocialConfig] = None,
+    geo_target: Optional[Dict[str, str]] = None,
+) -> Dict[str, str]:
+    """
+    Use OpenAI to generate a single social media post.
+
+    Returns: {"caption": "...", "hashtags": "...", "headline": "...", "link": "..."}
+    """
+    return generate_post_content_multi(content_type, [platform], config, geo_target)[platform]
 
 
 # ---------------------------------------------------------------------------
 # Image Generation (Pillow)
 # ---------------------------------------------------------------------------
 
-def generate_social_image(
-    content_type: str,
-    headline: str,
-    sub_text: str = "",
-) -> Optional[str]:
-    """
-    Generate a 1080x1080 branded social media image.
+@functools.lru_cache(maxsize=1)
+def _get_template() -> Image.Image:
+    """Render the static card chrome once per process.
 
-    Returns the file path to the saved image, or None on failure.
+    The accent bar, decoration, brand mark and bottom CTA are identical
+    for every post; only the pill, headline and sub text vary. Callers
+    must .copy() before drawing on the result.
     """
-    try:
-        img = Image.new("RGB", IMAGE_SIZE, BRAND_BG)
-        draw = ImageDraw.Draw(img)
+    img = Image.new("RGB", IMAGE_SIZE, BRAND_BG)
+    draw = ImageDraw.Draw(img)
 
-        # Decorative accent bar at top
-        draw.rectangle([(0, 0), (1080, 6)], fill=BRAND_ACCENT)
+    # Decorative accent bar at top
+    draw.rectangle([(0, 0), (1080, 6)], fill=BRAND_ACCENT)
 
-        # Accent circle decoration (top right)
-        draw.ellipse([(820, -60), (1140, 260)], fill=(*BRAND_ACCENT, 30), outline=None)
+    # Accent circle decoration (top right)
+    draw.ellipse([(820, -60), (1140, 260)], fill=(*BRAND_ACCENT, 30), outline=None)
 
-        # Brand name
-        brand_font = _get_bold_font(28)
-        draw.text((60, 40), "PRIMEHAUL", fill=BRAND_ACCENT, font=brand_font)
+    # Brand name
+    brand_font = _get_bold_font(28)
+    draw.text((60, 40), "PRIMEHAUL", fill=BRAND_ACCENT, font=brand_font)
+
+    # Bottom CTA bar
+    draw.rectangle([(0, 980), (1080, 1080)], fill=(20, 20, 22))
+    cta_font = _get_bold_font(24)
+    draw.text((60, 1010), "Get your free AI moving quote", fill=BRAND_ACCENT, font=cta_font)
+    url_font = _get_font(22)
+    display_url = settings.CANONICAL_DOMAIN.replace("https://", "").replace("http://", "").rstrip("/")
+    draw.text((60, 1042), display_url, fill=BRAND_MUTED, font=url_font)
+
+    # Accent line above CTA
+    draw.rectangle([(60, 970), (300, 974)], fill=BRAND_ACCENT)
+
+    return img
+
+
+# PNG encoding is the CPU-heavy half of image generation (~100-500ms per
+# card); a small pool lets the weekly job overlap encodes with its
+# I/O-bound OpenAI calls
+_image_executor = ThreadPoolExecutor(max_workers=2)
+
+
+def _render_social_image(
+    content_type: str,
+    headline: str,
+    sub_text: str = "",
+) -> Optional[Image.Image]:
+    """Draw a 1080x1080 branded card. Returns the image, or None on failure."""
+    try:
+        img = _get_template().copy()
+        draw = ImageDraw.Draw(img)
 
         # Content type pill
         pill_font = _get_font(20)
-        pillar_label = B2C_CONTENT_PILLARS.get(content_type, {}).get("label", content_type.title())
+        pillar_label = _PILLAR_LABELS.get(content_type, content_type.title())
         pill_w = draw.textlength(pillar_label, font=pill_font) + 32
         draw.rounded_rectangle(
             [(60, 85), (60 + pill_w, 115)],
@@ -301,46 +478,64 @@ def generate_social_image(
         )
         draw.text((76, 88), pillar_label, fill=BRAND_ACCENT, font=pill_font)
 
-        # Main headline
+        # Main headline — wrap() gives the line list directly, fill() would
+        # join on newlines only for us to split again
         headline_font = _get_bold_font(56)
-        wrapped = textwrap.fill(headline, width=22)
+        headline_lines = textwrap.wrap(headline, width=22)
         y_start = 200
-        for i, line in enumerate(wrapped.split("\n")):
+        for i, line in enumerate(headline_lines):
             draw.text((60, y_start + i * 70), line, fill=BRAND_WHITE, font=headline_font)
 
         # Sub text
         if sub_text:
             sub_font = _get_font(30)
-            sub_wrapped = textwrap.fill(sub_text, width=40)
-            sub_y = y_start + (len(wrapped.split("\n")) * 70) + 40
-            for i, line in enumerate(sub_wrapped.split("\n")):
+            sub_y = y_start + len(headline_lines) * 70 + 40
+            for i, line in enumerate(textwrap.wrap(sub_text, width=40)):
                 draw.text((60, sub_y + i * 40), line, fill=BRAND_MUTED, font=sub_font)
 
-        # Bottom CTA bar
-        draw.rectangle([(0, 980), (1080, 1080)], fill=(20, 20, 22))
-        cta_font = _get_bold_font(24)
-        draw.text((60, 1010), "Get your free AI moving quote", fill=BRAND_ACCENT, font=cta_font)
-        url_font = _get_font(22)
-        display_url = settings.CANONICAL_DOMAIN.replace("https://", "").replace("http://", "").rstrip("/")
-        draw.text((60, 1042), display_url, fill=BRAND_MUTED, font=url_font)
+        return img
 
-        # Accent line above CTA
-        draw.rectangle([(60, 970), (300, 974)], fill=BRAND_ACCENT)
+    except Exception as e:
+        logger.error(f"Image rendering failed: {e}")
+        return None
 
-        # Save
+
+def _save_social_image(img: Image.Image) -> Optional[str]:
+    """Encode a rendered card to PNG on disk. Returns the path, or None."""
+    try:
         img_dir = Path("app/static/social")
         img_dir.mkdir(parents=True, exist_ok=True)
-        filename = f"post_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}_{random.randint(1000,9999)}.png"
+        # token_hex is collision-free, unlike a second-resolution timestamp
+        # plus a four-digit suffix
+        filename = f"post_{secrets.token_hex(8)}.png"
         filepath = img_dir / filename
-        img.save(str(filepath), "PNG", optimize=True)
+        # optimize=True re-runs zlib at max effort for a few percent of
+        # size; these cards are re-encoded by every platform anyway, so
+        # take the fast compression level instead
+        img.save(str(filepath), "PNG", optimize=False, compress_level=1)
         logger.info(f"Generated social image: {filepath}")
         return str(filepath)
-
     except Exception as e:
-        logger.error(f"Image generation failed: {e}")
+        logger.error(f"Image encoding failed: {e}")
         return None
 
 
+def generate_social_image(
+    content_type: str,
+    headline: str,
+    sub_text: str = "",
+) -> Optional[str]:
+    """
+    Generate a 1080x1080 branded social media image.
+
+    Returns the file path to the saved image, or None on failure.
+    """
+    img = _render_social_image(content_type, headline, sub_text)
+    if img is None:
+        return None
+    return _save_social_image(img)
+
+
 # ---------------------------------------------------------------------------
 # Platform Publishing
 # ---------------------------------------------------------------------------
@@ -357,7 +552,7 @@ def post_to_facebook(caption: str, image_path: Optional[str] = None) -> Optional
         if image_path and Path(image_path).exists():
             url = f"https://graph.facebook.com/v21.0/{page_id}/photos"
             with open(image_path, "rb") as img_file:
-                resp = httpx.post(
+                resp = _http.post(
                     url,
                     data={"message": caption, "access_token": token},
                     files={"source": img_file},
@@ -365,7 +560,7 @@ def post_to_facebook(caption: str, image_path: Optional[str] = None) -> Optional
                 )
         else:
             url = f"https://graph.facebook.com/v21.0/{page_id}/feed"
-            resp = httpx.post(
+            resp = _http.post(
                 url,
                 data={"message": caption, "access_token": token},
                 timeout=30,
@@ -376,6 +571,10 @@ def post_to_facebook(caption: str, image_path: Optional[str] = None) -> Optional
         logger.info(f"Posted to Facebook: {post_id}")
         return post_id
 
+    except httpx.HTTPStatusError as e:
+        _raise_if_transient(e, "Facebook")
+        logger.error(f"Facebook posting failed ({e.response.status_code}): {e.response.text}")
+        return None
     except Exception as e:
         logger.error(f"Facebook posting failed: {e}")
         return None
@@ -440,7 +639,7 @@ def post_to_instagram(caption: str, image_path: Optional[str] = None) -> Optiona
 
         # Verify the image is reachable before creating the container
         try:
-            head_resp = httpx.head(image_url, timeout=10, follow_redirects=True)
+            head_resp = _http.head(image_url, timeout=10, follow_redirects=True)
             if head_resp.status_code != 200:
                 logger.error(f"Instagram image URL not reachable (HTTP {head_resp.status_code}): {image_url}")
                 return None
@@ -450,7 +649,7 @@ def post_to_instagram(caption: str, image_path: Optional[str] = None) -> Optiona
 
         # Step 1: Create media container
         create_url = f"https://graph.facebook.com/v21.0/{ig_account_id}/media"
-        create_resp = httpx.post(
+        create_resp = _http.post(
             create_url,
             data={
                 "image_url": image_url,
@@ -462,9 +661,27 @@ def post_to_instagram(caption: str, image_path: Optional[str] = None) -> Optiona
         create_resp.raise_for_status()
         container_id = create_resp.json()["id"]
 
-        # Step 2: Publish the container
+        # Step 2: Wait for the container to finish processing. Meta
+        # sometimes returns an in-progress container, and publishing it
+        # straight away fails. Poll with exponential backoff so we publish
+        # as soon as it's ready (usually <1s) instead of a fixed sleep.
+        for attempt in range(6):
+            status_resp = _http.get(
+                f"https://graph.facebook.com/v21.0/{container_id}",
+                params={"fields": "status_code", "access_token": token},
+                timeout=15,
+            )
+            status_code = status_resp.json().get("status_code")
+            if status_code == "FINISHED":
+                break
+            if status_code == "ERROR":
+                logger.error(f"Instagram container {container_id} failed processing")
+                return None
+            time.sleep(0.5 * (2 ** attempt))
+
+        # Step 3: Publish the container
         publish_url = f"https://graph.facebook.com/v21.0/{ig_account_id}/media_publish"
-        publish_resp = httpx.post(
+        publish_resp = _http.post(
             publish_url,
             data={
                 "creation_id": container_id,
@@ -477,6 +694,10 @@ def post_to_instagram(caption: str, image_path: Optional[str] = None) -> Optiona
         logger.info(f"Posted to Instagram: {post_id}")
         return post_id
 
+    except httpx.HTTPStatusError as e:
+        _raise_if_transient(e, "Instagram")
+        logger.error(f"Instagram posting failed ({e.response.status_code}): {e.response.text}")
+        return None
     except Exception as e:
         logger.error(f"Instagram posting failed: {e}")
         return None
@@ -493,18 +714,9 @@ def post_to_x(caption: str, image_path: Optional[str] = None) -> Optional[str]:
         return None
 
     try:
-        # V1.1 auth for media upload
-        auth = tweepy.OAuthHandler(api_key, api_secret)
-        auth.set_access_token(access_token, access_secret)
-        api_v1 = tweepy.API(auth)
-
-        # V2 client for tweeting
-        client = tweepy.Client(
-            consumer_key=api_key,
-            consumer_secret=api_secret,
-            access_token=access_token,
-            access_token_secret=access_secret,
-        )
+        # Cached clients: v1.1 for media upload, v2 for tweeting
+        api_v1 = _get_x_api_v1()
+        client = _get_x_client()
 
         media_ids = []
         if image_path and Path(image_path).exists():
@@ -519,6 +731,10 @@ def post_to_x(caption: str, image_path: Optional[str] = None) -> Optional[str]:
         logger.info(f"Posted to X: {tweet_id}")
         return tweet_id
 
+    except tweepy.TooManyRequests as e:
+        raise TransientPublishError("X returned HTTP 429") from e
+    except tweepy.TwitterServerError as e:
+        raise TransientPublishError(f"X returned HTTP {e.response.status_code}") from e
     except Exception as e:
         logger.error(f"X posting failed: {e}")
         return None
@@ -540,7 +756,7 @@ def _refresh_linkedin_token() -> Optional[str]:
         return None
 
     try:
-        resp = httpx.post(
+        resp = _http.post(
             "https://www.linkedin.com/oauth/v2/accessToken",
             data={
                 "grant_type": "refresh_token",
@@ -613,7 +829,7 @@ def post_to_linkedin(caption: str, image_path: Optional[str] = None) -> Optional
                     "owner": author,
                 }
             }
-            init_resp = httpx.post(init_url, headers=headers, json=init_body, timeout=30)
+            init_resp = _http.post(init_url, headers=headers, json=init_body, timeout=30)
             init_resp.raise_for_status()
             init_data = init_resp.json()["value"]
             upload_url = init_data["uploadUrl"]
@@ -621,13 +837,13 @@ def post_to_linkedin(caption: str, image_path: Optional[str] = None) -> Optional
 
             # Step 2: Upload the image binary
             with open(image_path, "rb") as img_file:
-                upload_resp = httpx.put(
+                upload_resp = _http.put(
                     upload_url,
                     headers={
                         "Authorization": f"Bearer {token}",
                         "Content-Type": "application/octet-stream",
                     },
-                    content=img_file.read(),
+                    content=img_file,
                     timeout=60,
                 )
                 upload_resp.raise_for_status()
@@ -653,7 +869,7 @@ def post_to_linkedin(caption: str, image_path: Optional[str] = None) -> Optional
                 }
             }
 
-        post_resp = httpx.post(post_url, headers=headers, json=post_body, timeout=30)
+        post_resp = _http.post(post_url, headers=headers, json=post_body, timeout=30)
         post_resp.raise_for_status()
         post_urn = post_resp.headers.get("x-restli-id", "")
         logger.info(f"Posted to LinkedIn: {post_urn}")
@@ -668,6 +884,7 @@ def post_to_linkedin(caption: str, image_path: Optional[str] = None) -> Optional
                 return post_to_linkedin(caption, image_path)  # Retry with new token
             logger.error("LinkedIn token refresh failed — cannot post")
         else:
+            _raise_if_transient(e, "LinkedIn")
             logger.error(f"LinkedIn posting failed ({e.response.status_code}): {e.response.text}")
         return None
     except Exception as e:
@@ -694,7 +911,7 @@ def check_facebook_engagement(post_id: str) -> Optional[Dict]:
         return None
     try:
         url = f"https://graph.facebook.com/v21.0/{post_id}"
-        resp = httpx.get(
+        resp = _http.get(
             url,
             params={
                 "fields": "likes.summary(true),comments.summary(true),shares",
@@ -723,12 +940,7 @@ def check_x_engagement(tweet_id: str) -> Optional[Dict]:
     if not all([api_key, api_secret, access_token, access_secret]) or not tweet_id:
         return None
     try:
-        client = tweepy.Client(
-            consumer_key=api_key,
-            consumer_secret=api_secret,
-            access_token=access_token,
-            access_token_secret=access_secret,
-        )
+        client = _get_x_client()
         resp = client.get_tweet(tweet_id, tweet_fields=["public_metrics"])
         metrics = resp.data.public_metrics if resp.data else {}
         return {
@@ -749,7 +961,7 @@ def check_instagram_engagement(media_id: str) -> Optional[Dict]:
         return None
     try:
         url = f"https://graph.facebook.com/v21.0/{media_id}/insights"
-        resp = httpx.get(
+        resp = _http.get(
             url,
             params={
                 "metric": "impressions,reach,likes,comments,shares",
@@ -785,7 +997,7 @@ def check_linkedin_engagement(post_urn: str) -> Optional[Dict]:
         # Fetch social actions (likes, comments, shares) for the post
         encoded_urn = post_urn.replace(":", "%3A").replace("(", "%28").replace(")", "%29")
         url = f"https://api.linkedin.com/rest/socialActions/{encoded_urn}"
-        resp = httpx.get(url, headers=headers, timeout=15)
+        resp = _http.get(url, headers=headers, timeout=15)
         resp.raise_for_status()
         data = resp.json()
         return {
@@ -829,15 +1041,32 @@ def generate_weekly_content():
         active_platforms = config.active_platforms or ["facebook", "instagram", "x", "linkedin"]
 
         now = datetime.now(timezone.utc)
-        posts_created = 0
+        new_posts: List[SocialPost] = []
+        pending_images: List[tuple] = []
+
+        # Prefetch occupied slots in one query instead of one existence
+        # check per (slot, platform). SQLite hands back naive datetimes,
+        # so normalise to UTC for the membership test.
+        existing_slots = set()
+        for platform, scheduled_for in (
+            db.query(SocialPost.platform, SocialPost.scheduled_for)
+            .filter(
+                SocialPost.scheduled_for > now,
+                SocialPost.status.in_(["scheduled", "published"]),
+            )
+            .all()
+        ):
+            if scheduled_for.tzinfo is None:
+                scheduled_for = scheduled_for.replace(tzinfo=timezone.utc)
+            existing_slots.add((platform, scheduled_for))
 
         for day_offset in range(7):
             day = now + timedelta(days=day_offset + 1)  # Start from tomorrow
             for slot_idx in range(min(posts_per_day, len(posting_times))):
                 time_str = posting_times[slot_idx]
                 try:
-                    parts = time_str.split(":")
-                    hour, minute = int(parts[0]), int(parts[1]) if len(parts) > 1 else 0
+                    hour_str, _, minute_str = time_str.partition(":")
+                    hour, minute = int(hour_str), int(minute_str or 0)
                     if not (0 <= hour <= 23 and 0 <= minute <= 59):
                         raise ValueError
                 except (ValueError, IndexError):
@@ -848,40 +1077,49 @@ def generate_weekly_content():
                 # Pick a content type
                 content_type = _pick_content_type(config)
 
-                # Generate for each active platform
-                for platform in active_platforms:
-                    # Check we don't already have a post scheduled for this slot
-                    existing = (
-                        db.query(SocialPost)
-                        .filter(
-                            SocialPost.platform == platform,
-                            SocialPost.scheduled_for == scheduled,
-                            SocialPost.status.in_(["scheduled", "published"]),
-                        )
-                        .first()
-                    )
-                    if existing:
-                        continue
+                # Geo-target ~40% of slots for local SEO
+                geo_target = None
+                if content_type == "local" or random.random() < 0.4:
+                    geo_target = _pick_geo_target()
+                    if content_type != "local":
+                        content_type = "local"
+
+                # Skip platforms that already have a post for this slot
+                platforms_needed = [
+                    platform for platform in active_platforms
+                    if (platform, scheduled) not in existing_slots
+                ]
+                if not platforms_needed:
+                    continue
 
-                    # Geo-target ~40% of posts for local SEO
-                    geo_target = None
-                    if content_type == "local" or random.random() < 0.4:
-                        geo_target = _pick_geo_target()
-                        if content_type != "local":
-                            content_type = "local"
+                # One OpenAI call per slot covering every platform variant
+                contents = generate_post_content_multi(
+                    content_type, platforms_needed, config, geo_target
+                )
+
+                # Render one card per slot and share it across platforms —
+                # the variants differ in caption copy, not in the artwork.
+                # The PNG encode goes to the worker pool so it overlaps the
+                # next slot's OpenAI round-trip; paths are collected below.
+                image_future = None
+                for platform in platforms_needed:
+                    content = contents[platform]
+                    if content["caption"]:
+                        img = _render_social_image(
+                            content_type,
+                            content["headline"],
+                            content["caption"][:80] + "..." if len(content["caption"]) > 80 else content["caption"],
+                        )
+                        if img is not None:
+                            image_future = _image_executor.submit(_save_social_image, img)
+                        break
 
-                    # Generate content
-                    content = generate_post_content(content_type, platform, config, geo_target)
+                slot_posts = []
+                for platform in platforms_needed:
+                    content = contents[platform]
                     if not content["caption"]:
                         continue
 
-                    # Generate image
-                    image_path = generate_social_image(
-                        content_type,
-                        content["headline"],
-                        content["caption"][:80] + "..." if len(content["caption"]) > 80 else content["caption"],
-                    )
-
                     # Combine caption + hashtags
                     full_caption = content["caption"]
                     if content["hashtags"]:
@@ -890,19 +1128,33 @@ def generate_weekly_content():
                     post = SocialPost(
                         platform=platform,
                         content_type=content_type,
-                        content_pillar=B2C_CONTENT_PILLARS.get(content_type, {}).get("label", content_type),
+                        content_pillar=_PILLAR_LABELS.get(content_type, content_type),
                         caption=full_caption,
                         hashtags=content["hashtags"],
-                        image_path=image_path,
+                        image_path=None,
                         scheduled_for=scheduled,
                         status="scheduled" if config.auto_publish else "draft",
                     )
-                    db.add(post)
-                    posts_created += 1
-
+                    new_posts.append(post)
+                    slot_posts.append(post)
+
+                if image_future and slot_posts:
+                    pending_images.append((image_future, slot_posts))
+
+        # Collect the encoded image paths; by now the encodes have run
+        # underneath the later slots' OpenAI calls
+        for image_future, slot_posts in pending_images:
+            image_path = image_future.result()
+            for post in slot_posts:
+                post.image_path = image_path
+
+        # Bulk path skips per-instance identity-map bookkeeping; nothing
+        # reads these rows back within this unit of work
+        if new_posts:
+            db.bulk_save_objects(new_posts)
         config.last_generation_at = now
         db.commit()
-        logger.info(f"Weekly content generation complete: {posts_created} posts created")
+        logger.info(f"Weekly content generation complete: {len(new_posts)} posts created")
 
     except Exception as e:
         db.rollback()
@@ -932,15 +1184,47 @@ def publish_due_posts():
             logger.debug("No posts due for publishing")
             return
 
-        for post in due_posts:
-            publisher = PLATFORM_PUBLISHERS.get(post.platform)
-            if not publisher:
-                post.status = "failed"
-                post.error_message = f"Unknown platform: {post.platform}"
-                continue
+        # Publish concurrently: each publisher blocks on platform HTTP
+        # round-trips, so overlapping them cuts wall time from the sum of
+        # per-platform latencies to roughly the slowest one. DB mutations
+        # stay on this thread — the session is not thread-safe.
+        futures = {}
+        with ThreadPoolExecutor(max_workers=len(due_posts)) as executor:
+            for post in due_posts:
+                publisher = PLATFORM_PUBLISHERS.get(post.platform)
+                if not publisher:
+                    post.status = "failed"
+                    post.error_message = f"Unknown platform: {post.platform}"
+                    continue
 
-            logger.info(f"Publishing {post.platform} post {post.id}...")
-            platform_id = publisher(post.caption, post.image_path)
+                logger.info(f"Publishing {post.platform} post {post.id}...")
+                futures[post] = executor.submit(publisher, post.caption, post.image_path)
+
+        for post, future in futures.items():
+            # Publishers catch their own errors and return None, but guard
+            # against anything that escapes the worker thread
+            try:
+                platform_id = future.result()
+            except TransientPublishError as e:
+                # Rate limit or platform outage: re-queue with backoff so
+                # the generated content isn't thrown away and regenerated
+                retries = post.retry_count or 0
+                if retries < MAX_PUBLISH_RETRIES:
+                    post.retry_count = retries + 1
+                    post.scheduled_for = now + timedelta(minutes=2 ** retries)
+                    post.error_message = str(e)
+                    logger.warning(
+                        f"Transient failure for {post.platform} post {post.id} ({e}) — "
+                        f"retry {post.retry_count} queued"
+                    )
+                else:
+                    post.status = "failed"
+                    post.error_message = f"{e} — gave up after {retries} retries"
+                    logger.warning(f"Failed to publish {post.platform} post {post.id} after {retries} retries")
+                continue
+            except Exception as e:
+                logger.error(f"Publisher for {post.platform} post {post.id} raised: {e}")
+                platform_id = None
 
             if platform_id:
                 post.status = "published"
@@ -967,8 +1251,10 @@ def check_all_engagement():
     db = SessionLocal()
     try:
         cutoff = datetime.now(timezone.utc) - timedelta(days=7)
+        # Only three columns are needed to fetch metrics, so skip hydrating
+        # full SocialPost objects (caption, hashtags, engagement blob)
         recent_posts = (
-            db.query(SocialPost)
+            db.query(SocialPost.id, SocialPost.platform, SocialPost.platform_post_id)
             .filter(
                 SocialPost.status == "published",
                 SocialPost.published_at >= cutoff,
@@ -977,17 +1263,31 @@ def check_all_engagement():
             .all()
         )
 
-        updated = 0
-        for post in recent_posts:
-            checker = ENGAGEMENT_CHECKERS.get(post.platform)
-            if not checker:
-                continue
-
-            metrics = checker(post.platform_post_id)
-            if metrics:
-                post.engagement = metrics
-                updated += 1
+        # One metrics fetch per post is pure I/O wait, so overlap the
+        # round-trips in a thread pool. Checkers only read credentials and
+        # return a dict; results are collected on this thread because the
+        # session is not thread-safe.
+        updates = []
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            futures = {
+                executor.submit(ENGAGEMENT_CHECKERS[platform], platform_post_id): (post_id, platform)
+                for post_id, platform, platform_post_id in recent_posts
+                if platform in ENGAGEMENT_CHECKERS
+            }
+            for future in as_completed(futures):
+                post_id, platform = futures[future]
+                try:
+                    metrics = future.result()
+                except Exception as e:
+                    logger.error(f"Engagement check for {platform} post {post_id} raised: {e}")
+                    continue
+                if metrics:
+                    updates.append({"id": post_id, "engagement": metrics})
 
+        updated = len(updates)
+        if updates:
+            # Bulk UPDATE by primary key writes just the engagement column
+            db.bulk_update_mappings(SocialPost, updates)
         db.commit()
         logger.info(f"Engagement check complete: {updated}/{len(recent_posts)} posts updated")
 
@@ -1027,7 +1327,13 @@ def manually_publish_post(db: Session, post_id: str) -> Tuple[bool, str]:
     if not publisher:
         return False, f"Unknown platform: {post.platform}"
 
-    platform_id = publisher(post.caption, post.image_path)
+    try:
+        platform_id = publisher(post.caption, post.image_path)
+    except TransientPublishError as e:
+        # Leave the post scheduled — the admin can retry shortly
+        post.error_message = str(e)
+        db.commit()
+        return False, f"Platform temporarily unavailable ({e}) — try again in a few minutes"
     if platform_id:
         post.status = "published"
         post.published_at = datetime.now(timezone.utc)
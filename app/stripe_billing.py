@@ -5,12 +5,19 @@ Handles per-lead purchases via Stripe Checkout Sessions and processes
 webhook events to confirm payments.
 """
 
+import functools
+import hashlib
+import hmac
 import logging
 import os
+import time
 from datetime import datetime, timezone
 
+import orjson
 import stripe
 from dotenv import load_dotenv
+from sqlalchemy import text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app.config import settings
 from app.models import LeadNotification, LeadPurchase, StripeEvent
@@ -23,6 +30,16 @@ stripe.api_key = os.getenv("STRIPE_SECRET_KEY", "")
 
 APP_URL = settings.APP_URL.rstrip("/")
 
+# Checkout redirect templates, built once. {CHECKOUT_SESSION_ID} is a
+# literal placeholder that Stripe substitutes, hence %s for our own ids.
+_SUCCESS_URL_TMPL = (
+    APP_URL + "/company/purchase-success?session_id={CHECKOUT_SESSION_ID}&lead_id=%s"
+)
+_CANCEL_URL_TMPL = APP_URL + "/company/leads/%s/preview"
+
+# Checkout product description, built once
+_DESC_TMPL = "{cbm} CBM | {items} items | {ptype}"
+
 
 # ---------------------------------------------------------------------------
 # Customer management
@@ -46,9 +63,29 @@ def ensure_stripe_customer(company, db) -> str:
         metadata={"company_id": str(company.id)},
     )
 
-    company.stripe_customer_id = customer.id
+    # Targeted UPDATE rather than mutating the ORM object: a commit here
+    # would flush whatever else the caller has dirtied, and the IS NULL
+    # guard makes the write idempotent when two requests race the
+    # customer creation.
+    from app.models import Company
+
+    result = db.execute(
+        update(Company)
+        .where(Company.id == company.id, Company.stripe_customer_id.is_(None))
+        .values(stripe_customer_id=customer.id)
+    )
     db.commit()
 
+    if result.rowcount == 0:
+        # Another worker created and stored a customer first -- use theirs
+        # and drop ours so Stripe doesn't accumulate orphans
+        db.refresh(company)
+        try:
+            stripe.Customer.delete(customer.id)
+        except Exception:
+            logger.warning("Could not delete duplicate Stripe customer %s", customer.id)
+        return company.stripe_customer_id
+
     logger.info(
         "Created Stripe customer %s for company %s (%s)",
         customer.id,
@@ -61,6 +98,31 @@ def ensure_stripe_customer(company, db) -> str:
 # ---------------------------------------------------------------------------
 # Checkout session creation
 # ---------------------------------------------------------------------------
+def _lead_areas(lead) -> tuple:
+    """Return (pickup_area, dropoff_area) display strings for a lead."""
+    # Lead.pickup/dropoff are validated as dict-or-None on assignment,
+    # so no per-call shape check is needed here
+    pickup_area = "Unknown"
+    dropoff_area = "Unknown"
+    if lead.pickup:
+        pickup_area = lead.pickup.get("city") or lead.pickup.get("postcode", "Unknown")
+    if lead.dropoff:
+        dropoff_area = (
+            lead.dropoff.get("city") or lead.dropoff.get("postcode", "Unknown")
+        )
+    return pickup_area, dropoff_area
+
+
+def purchase_summary(lead) -> str:
+    """One-line lead snapshot stored on ``LeadPurchase.summary``.
+
+    Captures everything the purchase-history list renders, so that view
+    never has to join back to ``leads``.
+    """
+    pickup_area, dropoff_area = _lead_areas(lead)
+    return f"{pickup_area} to {dropoff_area} | {lead.total_cbm or 0} CBM"
+
+
 def create_lead_purchase_session(company, lead, db) -> dict:
     """Create a Stripe Checkout Session for purchasing a single lead.
 
@@ -79,27 +141,17 @@ def create_lead_purchase_session(company, lead, db) -> dict:
     customer_id = ensure_stripe_customer(company, db)
 
     # Build redirect URLs
-    success_url = (
-        f"{APP_URL}/company/purchase-success"
-        f"?session_id={{CHECKOUT_SESSION_ID}}&lead_id={lead.id}"
-    )
-    cancel_url = f"{APP_URL}/company/leads/{lead.id}/preview"
+    success_url = _SUCCESS_URL_TMPL % lead.id
+    cancel_url = _CANCEL_URL_TMPL % lead.id
 
     # Derive a human-friendly description
-    pickup_area = "Unknown"
-    dropoff_area = "Unknown"
-    if lead.pickup and isinstance(lead.pickup, dict):
-        pickup_area = lead.pickup.get("city") or lead.pickup.get("postcode", "Unknown")
-    if lead.dropoff and isinstance(lead.dropoff, dict):
-        dropoff_area = (
-            lead.dropoff.get("city") or lead.dropoff.get("postcode", "Unknown")
-        )
-
+    pickup_area, dropoff_area = _lead_areas(lead)
     product_name = f"Moving Lead: {pickup_area} to {dropoff_area}"
-    product_description = (
-        f"{lead.total_cbm or 0} CBM | {lead.total_items or 0} items | "
-        f"{lead.property_type or 'N/A'}"
-    )
+    product_description = _DESC_TMPL.format_map({
+        "cbm": lead.total_cbm or 0,
+        "items": lead.total_items or 0,
+        "ptype": lead.property_type or "N/A",
+    })
 
     # Create the Stripe Checkout Session
     session = stripe.checkout.Session.create(
@@ -133,6 +185,7 @@ def create_lead_purchase_session(company, lead, db) -> dict:
         lead_id=lead.id,
         company_id=company.id,
         price_pence=lead.lead_price_pence,
+        summary=purchase_summary(lead),
         stripe_checkout_session_id=session.id,
         payment_status="pending",
     )
@@ -208,17 +261,31 @@ def handle_checkout_completed(session_data: dict, db):
     purchase.stripe_payment_intent_id = payment_intent_id
 
     # Update the corresponding LeadNotification's purchased_at timestamp
-    if lead_id and company_id:
-        notification = (
-            db.query(LeadNotification)
-            .filter(
-                LeadNotification.lead_id == lead_id,
-                LeadNotification.company_id == company_id,
-            )
-            .first()
+    notification = (
+        db.query(LeadNotification)
+        .filter(
+            LeadNotification.lead_id == purchase.lead_id,
+            LeadNotification.company_id == purchase.company_id,
         )
-        if notification:
-            notification.purchased_at = now
+        .first()
+    )
+    if notification:
+        notification.purchased_at = now
+
+    # Queue the confirmation email through the outbox, in the same
+    # transaction as the payment-state change: the webhook answers
+    # without paying SMTP latency, and the email goes out iff the
+    # mark-paid commit sticks
+    from app.outbox import enqueue_outbox_event
+
+    enqueue_outbox_event(
+        db,
+        "purchase_confirmation",
+        {
+            "lead_id": str(purchase.lead_id),
+            "company_id": str(purchase.company_id),
+        },
+    )
 
     db.commit()
 
@@ -230,37 +297,91 @@ def handle_checkout_completed(session_data: dict, db):
         company_id,
     )
 
-    # Send purchase confirmation email
-    try:
-        from app.notifications import send_purchase_confirmation
-        from app.models import Company, Lead
-
-        company = db.query(Company).filter(Company.id == company_id).first()
-        lead = db.query(Lead).filter(Lead.id == lead_id).first()
-        if company and lead:
-            send_purchase_confirmation(company, lead)
-    except ImportError:
-        logger.warning("notifications module not available -- skipping confirmation email")
-    except Exception:
-        logger.exception(
-            "Failed to send purchase confirmation for lead %s, company %s",
-            lead_id,
-            company_id,
-        )
-
 
 # ---------------------------------------------------------------------------
 # Webhook signature verification
 # ---------------------------------------------------------------------------
+# Same replay-window tolerance as stripe.Webhook.construct_event
+_SIGNATURE_TOLERANCE_SECONDS = 300
+
+
+@functools.lru_cache(maxsize=4)
+def _hmac_base(secret: str) -> hmac.HMAC:
+    """HMAC with the key schedule absorbed, ready to be ``.copy()``-ed.
+
+    Deriving the inner/outer padded key costs two SHA-256 block ops;
+    caching the keyed state pays that once per secret instead of on
+    every webhook delivery, including the rejected ones.
+    """
+    return hmac.new(secret.encode(), digestmod=hashlib.sha256)
+
+
+def _verify_signature(payload: bytes, sig_header: str, secret: str) -> None:
+    """Check the ``Stripe-Signature`` header against the raw payload.
+
+    Implements Stripe's v1 scheme (HMAC-SHA256 over
+    ``"{timestamp}.{payload}"``) directly, so verification does not
+    require building a ``stripe.Event`` object tree first.
+
+    Raises:
+        stripe.error.SignatureVerificationError: If the header is
+            malformed, the signature does not match, or the timestamp
+            is outside the replay tolerance window.
+    """
+    timestamp = ""
+    v1_signatures = []
+    for item in sig_header.split(","):
+        key, _, value = item.strip().partition("=")
+        if key == "t":
+            timestamp = value
+        elif key == "v1":
+            v1_signatures.append(value)
+
+    if not timestamp or not v1_signatures:
+        raise stripe.error.SignatureVerificationError(
+            "Unable to extract timestamp and signatures from header",
+            sig_header,
+            payload,
+        )
+
+    h = _hmac_base(secret).copy()
+    h.update(b"%s.%s" % (timestamp.encode(), payload))
+    # Compare as bytes: compare_digest raises TypeError on non-ASCII str
+    # input, and a garbage v1 value must reject, not error
+    expected = h.hexdigest().encode()
+    if not any(hmac.compare_digest(expected, sig.encode()) for sig in v1_signatures):
+        raise stripe.error.SignatureVerificationError(
+            "No signatures found matching the expected signature for payload",
+            sig_header,
+            payload,
+        )
+
+    try:
+        age = abs(time.time() - int(timestamp))
+    except ValueError:
+        age = _SIGNATURE_TOLERANCE_SECONDS + 1
+    if age > _SIGNATURE_TOLERANCE_SECONDS:
+        raise stripe.error.SignatureVerificationError(
+            "Timestamp outside the tolerance zone",
+            sig_header,
+            payload,
+        )
+
+
 def verify_webhook_signature(payload: bytes, sig_header: str) -> dict:
     """Verify a Stripe webhook signature and return the parsed event.
 
+    Verification runs against the raw bytes and the event comes back as
+    a plain dict -- the full ``stripe.Event`` object tree that
+    ``construct_event`` would build is never needed here, since the
+    dispatcher only reads ``type``, ``id`` and ``data.object``.
+
     Args:
         payload: The raw request body bytes.
         sig_header: The ``Stripe-Signature`` header value.
 
     Returns:
-        The verified Stripe event as a dict-like object.
+        The verified Stripe event as a dict.
 
     Raises:
         stripe.error.SignatureVerificationError: If the signature is invalid.
@@ -272,13 +393,61 @@ def verify_webhook_signature(payload: bytes, sig_header: str) -> dict:
             "STRIPE_WEBHOOK_SECRET is not configured -- cannot verify webhooks"
         )
 
-    event = stripe.Webhook.construct_event(payload, sig_header, webhook_secret)
-    return event
+    _verify_signature(payload, sig_header, webhook_secret)
+    # orjson parses the 5-20 KB nested payloads several times faster than
+    # stdlib json, matching the engine-level JSONB codec choice
+    return orjson.loads(payload)
 
 
 # ---------------------------------------------------------------------------
 # Webhook handler (called from a route in main.py or company_routes.py)
 # ---------------------------------------------------------------------------
+def _claim_stripe_event(db, event_id: str, event_type: str, event: dict) -> bool:
+    """Record the event for idempotency. Returns True if already processed.
+
+    On Postgres the audit row is claimed with a single
+    ``INSERT .. ON CONFLICT DO NOTHING RETURNING id`` against the unique
+    ``stripe_event_id`` index, so the existence check and the insert are
+    one statement and concurrent deliveries cannot both pass a
+    check-then-insert window. SQLite (tests) keeps the two-step flow.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        claimed = db.execute(
+            pg_insert(StripeEvent)
+            .values(
+                stripe_event_id=event_id,
+                event_type=event_type,
+                payload=event,
+                processed=False,
+            )
+            .on_conflict_do_nothing(index_elements=["stripe_event_id"])
+            .returning(StripeEvent.id)
+        ).scalar()
+        if claimed is not None:
+            return False
+        return bool(
+            db.query(StripeEvent.processed)
+            .filter(StripeEvent.stripe_event_id == event_id)
+            .scalar()
+        )
+
+    existing = (
+        db.query(StripeEvent)
+        .filter(StripeEvent.stripe_event_id == event_id)
+        .first()
+    )
+    if existing is not None:
+        return bool(existing.processed)
+    db.add(StripeEvent(
+        stripe_event_id=event_id,
+        event_type=event_type,
+        payload=event,
+        processed=False,
+    ))
+    db.flush()
+    return False
+
+
 def handle_stripe_webhook(payload: bytes, sig_header: str, db) -> dict:
     """Top-level webhook handler that verifies the signature, logs the
     event, and dispatches to the appropriate handler.
@@ -306,40 +475,51 @@ def handle_stripe_webhook(payload: bytes, sig_header: str, db) -> dict:
     event_type = event.get("type", "")
     event_id = event.get("id", "")
 
-    # Idempotency: check if we have already processed this event
-    existing = (
-        db.query(StripeEvent)
-        .filter(StripeEvent.stripe_event_id == event_id)
-        .first()
-    )
-    if existing and existing.processed:
+    # Idempotency: claim the event id before doing any work
+    if _claim_stripe_event(db, event_id, event_type, event):
         logger.info("Stripe event %s already processed -- skipping", event_id)
         return {"status": "already_processed"}
 
-    # Log the event
-    if existing is None:
-        stripe_event = StripeEvent(
-            stripe_event_id=event_id,
-            event_type=event_type,
-            payload=event,
-            processed=False,
-        )
-        db.add(stripe_event)
-        db.flush()
-    else:
-        stripe_event = existing
-
     # Dispatch by event type
     if event_type == "checkout.session.completed":
         session_data = event.get("data", {}).get("object", {})
+
+        # Stripe delivers at-least-once and can race the same session
+        # across two workers; a transaction-scoped advisory lock makes
+        # the mark-paid/confirmation-email section single-entrant. The
+        # key is a stable digest of the session id -- Python's hash()
+        # varies per process and would not lock across workers.
+        if db.get_bind().dialect.name == "postgresql":
+            session_id = session_data.get("id") or event_id
+            lock_key = int.from_bytes(
+                hashlib.sha256(session_id.encode()).digest()[:8], "big"
+            ) & 0x7FFFFFFFFFFFFFFF
+            got_lock = db.execute(
+                text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": lock_key}
+            ).scalar()
+            if not got_lock:
+                logger.info(
+                    "Stripe event %s is being handled by another worker -- skipping",
+                    event_id,
+                )
+                return {"status": "concurrent_skip"}
+
         handle_checkout_completed(session_data, db)
-        stripe_event.processed = True
+        db.execute(
+            update(StripeEvent)
+            .where(StripeEvent.stripe_event_id == event_id)
+            .values(processed=True)
+        )
         db.commit()
         logger.info("Processed Stripe event: %s (%s)", event_type, event_id)
         return {"status": "processed", "event_type": event_type}
 
     # Unhandled event types are acknowledged but not processed
-    stripe_event.processed = True
+    db.execute(
+        update(StripeEvent)
+        .where(StripeEvent.stripe_event_id == event_id)
+        .values(processed=True)
+    )
     db.commit()
     logger.info("Acknowledged unhandled Stripe event: %s (%s)", event_type, event_id)
     return {"status": "ignored", "event_type": event_type}
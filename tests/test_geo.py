@@ -1,6 +1,12 @@
 """Unit tests for the geo module."""
 
-from app.geo import calculate_distance_miles, extract_postcode_area, validate_coordinates
+from app.geo import (
+    bounding_box,
+    calculate_distance_miles,
+    distance_calculator_miles,
+    extract_postcode_area,
+    validate_coordinates,
+)
 
 
 class TestValidateCoordinates:
@@ -32,6 +38,32 @@ class TestCalculateDistanceMiles:
         assert calculate_distance_miles(999, 0, 51.5, -0.1) == 0.0
 
 
+class TestDistanceCalculatorMiles:
+    def test_matches_scalar_function(self):
+        distance_from_london = distance_calculator_miles(51.5074, -0.1278)
+        for lat, lng in [(53.4808, -2.2426), (55.9533, -3.1883), (51.5074, -0.1278)]:
+            assert distance_from_london(lat, lng) == calculate_distance_miles(
+                51.5074, -0.1278, lat, lng
+            )
+
+    def test_invalid_coordinates_return_zero(self):
+        assert distance_calculator_miles(999, 0)(51.5, -0.1) == 0.0
+        assert distance_calculator_miles(51.5, -0.1)(999, 0) == 0.0
+
+
+class TestBoundingBox:
+    def test_contains_points_within_radius(self):
+        # Manchester is ~163 miles from London; a 200-mile box must contain it
+        min_lat, max_lat, min_lng, max_lng = bounding_box(51.5074, -0.1278, 200)
+        assert min_lat <= 53.4808 <= max_lat
+        assert min_lng <= -2.2426 <= max_lng
+
+    def test_box_is_centred_on_point(self):
+        min_lat, max_lat, min_lng, max_lng = bounding_box(51.5, -0.1, 30)
+        assert min_lat < 51.5 < max_lat
+        assert min_lng < -0.1 < max_lng
+
+
 class TestExtractPostcodeArea:
     def test_full_postcode(self):
         assert extract_postcode_area("SW1A 2AA") == "SW1A"
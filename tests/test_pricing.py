@@ -1,7 +1,7 @@
 """Unit tests for the pricing module."""
 
 from types import SimpleNamespace
-from app.pricing import calculate_lead_estimate, _access_cost
+from app.pricing import calculate_lead_estimate, calculate_lead_estimates, _access_cost
 
 
 def _make_lead(**kwargs):
@@ -45,6 +45,25 @@ class TestCalculateLeadEstimate:
         result = calculate_lead_estimate(lead)
         assert result["breakdown"]["distance_cost"] > 0
 
+    def test_zero_coordinate_is_not_treated_as_missing(self):
+        # 0.0 longitude runs through London; it must still price distance
+        lead = _make_lead(
+            pickup={"lat": 51.5074, "lng": 0.0},
+            dropoff={"lat": 53.4808, "lng": -2.2426},
+        )
+        result = calculate_lead_estimate(lead)
+        assert result["breakdown"]["distance_cost"] > 0
+
+
+class TestCalculateLeadEstimates:
+    def test_matches_single_lead_results(self):
+        leads = [_make_lead(total_cbm=5), _make_lead(total_cbm=50), _make_lead(bulky_items=4)]
+        batch = calculate_lead_estimates(leads)
+        assert batch == [calculate_lead_estimate(lead) for lead in leads]
+
+    def test_empty_batch(self):
+        assert calculate_lead_estimates([]) == []
+
 
 class TestAccessCost:
     def test_empty_access(self):
@@ -0,0 +1,51 @@
+"""Unit tests for Stripe webhook signature verification."""
+
+import hashlib
+import hmac
+import time
+
+import pytest
+import stripe
+
+from app.stripe_billing import _verify_signature
+
+SECRET = "whsec_test_secret"
+PAYLOAD = b'{"id": "evt_123", "type": "checkout.session.completed"}'
+
+
+def _sign(payload: bytes, secret: str, timestamp: int = None) -> str:
+    """Build a Stripe-Signature header the way Stripe signs payloads."""
+    ts = int(time.time()) if timestamp is None else timestamp
+    signed = b"%d.%s" % (ts, payload)
+    sig = hmac.new(secret.encode(), signed, hashlib.sha256).hexdigest()
+    return f"t={ts},v1={sig}"
+
+
+class TestVerifySignature:
+    def test_valid_signature_accepted(self):
+        _verify_signature(PAYLOAD, _sign(PAYLOAD, SECRET), SECRET)
+
+    def test_tampered_payload_rejected(self):
+        header = _sign(PAYLOAD, SECRET)
+        with pytest.raises(stripe.error.SignatureVerificationError):
+            _verify_signature(PAYLOAD + b"x", header, SECRET)
+
+    def test_wrong_secret_rejected(self):
+        header = _sign(PAYLOAD, "whsec_other_secret")
+        with pytest.raises(stripe.error.SignatureVerificationError):
+            _verify_signature(PAYLOAD, header, SECRET)
+
+    def test_stale_timestamp_rejected(self):
+        header = _sign(PAYLOAD, SECRET, timestamp=int(time.time()) - 400)
+        with pytest.raises(stripe.error.SignatureVerificationError):
+            _verify_signature(PAYLOAD, header, SECRET)
+
+    def test_malformed_header_rejected(self):
+        with pytest.raises(stripe.error.SignatureVerificationError):
+            _verify_signature(PAYLOAD, "not-a-signature-header", SECRET)
+
+    def test_non_ascii_signature_rejected_not_typeerror(self):
+        ts = int(time.time())
+        header = f"t={ts},v1=égarbage"
+        with pytest.raises(stripe.error.SignatureVerificationError):
+            _verify_signature(PAYLOAD, header, SECRET)